@@ -0,0 +1,85 @@
+"""
+Benchmarks feed parsing throughput against the number of worker processes.
+
+Generates synthetic Medium-style RSS feeds and parses them with `parse_feeds`
+at increasing worker counts, up to the number of CPUs. Speedup is relative to
+parsing in a single process.
+
+Usage:
+    python benchmarks/bench_feed_parsing.py --feeds 48 --items 10
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "src"))
+
+from scraper import parse_feeds  # noqa: E402
+
+
+def make_feed(items: int, paragraphs: int) -> str:
+    """Builds a synthetic RSS feed document resembling a Medium feed."""
+    body = "".join(
+        f"<h3>Section {p}</h3><p>Partitioning splits a table into segments "
+        f"by a column. Queries that filter on it scan less data and cost "
+        f"less. Paragraph {p}.</p>"
+        for p in range(paragraphs)
+    )
+    entries = "".join(
+        f"""
+    <item>
+      <title>Article {i}</title>
+      <category>data</category>
+      <category>google-cloud</category>
+      <guid>https://medium.com/p/{i}</guid>
+      <pubDate>Mon, 0{i % 9 + 1} Jan 2024 10:00:00 GMT</pubDate>
+      <content:encoded><![CDATA[{body}]]></content:encoded>
+    </item>"""
+        for i in range(items)
+    )
+    return f"<rss><channel>{entries}\n  </channel></rss>"
+
+
+def worker_counts(cpus: int):
+    counts, n = [], 1
+    while n < cpus:
+        counts.append(n)
+        n *= 2
+    counts.append(cpus)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark process-pool feed parsing.")
+    parser.add_argument("--feeds", type=int, default=48,
+                        help="Number of feed documents to parse")
+    parser.add_argument("--items", type=int, default=10,
+                        help="Articles per feed")
+    parser.add_argument("--paragraphs", type=int, default=40,
+                        help="Sections per article")
+    parser.add_argument("--max-workers", type=int,
+                        default=os.cpu_count() or 1,
+                        help="Largest worker count to try")
+    args = parser.parse_args()
+
+    feeds = [make_feed(args.items, args.paragraphs) for _ in range(args.feeds)]
+    size_mb = sum(len(feed) for feed in feeds) / 1e6
+    print(f"{args.feeds} feeds x {args.items} items ({size_mb:.1f} MB), "
+          f"{os.cpu_count()} CPU(s)")
+    print(f"{'workers':>8} {'seconds':>9} {'feeds/s':>9} {'speedup':>8}")
+
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        start = time.perf_counter()
+        parse_feeds(feeds, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {args.feeds / elapsed:>9.1f} "
+              f"{baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, TypeVar
+import yaml
+from openai import OpenAI, BadRequestError
+from deadline import Deadline, DeadlineExceeded
+
+# Set up logging
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s - %(levelname)s - %(module)s - "
+                           "%(message)s")
+
+T = TypeVar("T")
+
+# Errors caused by the request itself fail on every backend, so they are not
+# retried elsewhere
+NON_FAILOVER_ERRORS = (BadRequestError,)
+
+
+class Backend:
+    """
+    One OpenAI-compatible endpoint and API key, with its health and usage
+    stats.
+
+    Args:
+        name (str): A label used in logs and stats.
+        api_key (str): The API key to authenticate with.
+        base_url (Optional[str]): The endpoint to call. Defaults to OpenAI's
+            API.
+        weight (float): The relative share of traffic this backend should
+            take.
+        cooldown (float): Seconds a backend is skipped after its first
+            consecutive error; doubled for each further error up to
+            `max_cooldown`.
+        max_cooldown (float): The longest a failing backend is skipped for.
+    """
+
+    def __init__(self, name: str, api_key: str,
+                 base_url: Optional[str] = None, weight: float = 1.0,
+                 cooldown: float = 5.0, max_cooldown: float = 120.0):
+        if weight <= 0:
+            raise ValueError(f"Backend '{name}' must have a positive weight.")
+        self.name = name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.weight = weight
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.unhealthy_until = 0.0
+        self._latencies = deque(maxlen=100)
+        self._client = None
+
+    def client(self) -> OpenAI:
+        """
+        Returns the (cached) OpenAI client for this backend.
+
+        SDK retries are disabled: a failing backend should fail over to the
+        next one straight away rather than back off and retry itself.
+        """
+        if self._client is None:
+            self._client = OpenAI(api_key=self.api_key,
+                                  base_url=self.base_url, max_retries=0)
+        return self._client
+
+    def healthy(self, now: float) -> bool:
+        """Returns True unless the backend is cooling down after errors."""
+        return now >= self.unhealthy_until
+
+    def record_success(self, latency: float):
+        self._latencies.append(latency)
+        self.consecutive_errors = 0
+        self.unhealthy_until = 0.0
+
+    def record_error(self, now: float):
+        self.errors += 1
+        self.consecutive_errors += 1
+        backoff = self.cooldown * 2 ** (self.consecutive_errors - 1)
+        self.unhealthy_until = now + min(self.max_cooldown, backoff)
+
+    def stats(self, now: float) -> Dict[str, object]:
+        """Returns the backend's latency and error stats."""
+        latencies = sorted(self._latencies)
+        mean_latency = p95_latency = None
+        if latencies:
+            mean_latency = sum(latencies) / len(latencies)
+            p95_latency = latencies[int(0.95 * (len(latencies) - 1))]
+        return {
+            "name": self.name,
+            "base_url": self.base_url,
+            "weight": self.weight,
+            "healthy": self.healthy(now),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "mean_latency": mean_latency,
+            "p95_latency": p95_latency,
+        }
+
+
+class BackendPool:
+    """
+    Routes LLM calls across several backends and fails over on errors.
+
+    Each call goes to the healthy backend with the fewest outstanding requests
+    relative to its weight; ties go to the backend that has served the least
+    weighted traffic. A backend that errors is put into a cooldown and the
+    call moves to the next one. If every backend is cooling down, the one that
+    recovers soonest is tried anyway.
+
+    Args:
+        backends (List[Backend]): The backends to route between.
+    """
+
+    def __init__(self, backends: List[Backend], _clock=time.monotonic):
+        if not backends:
+            raise ValueError("A backend pool needs at least one backend.")
+        self.backends = backends
+        self._clock = _clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path: str) -> "BackendPool":
+        """
+        Builds a pool from the `backends` list of a YAML file.
+
+        Each entry has a `name`, either an `api_key` or an `api_key_env`
+        naming the environment variable holding the key, and optionally
+        `base_url` and `weight`.
+
+        Args:
+            path (str): The path to the YAML file.
+
+        Returns:
+            BackendPool: The configured pool.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file cannot be parsed or an entry is invalid.
+        """
+        try:
+            with open(path, 'r') as conf_file:
+                conf = yaml.safe_load(conf_file) or {}
+        except FileNotFoundError:
+            logging.error(f"Backend configuration file not found at: {path}")
+            raise FileNotFoundError(
+                f"Backend configuration file {path} not found.")
+        except yaml.YAMLError as e:
+            raise ValueError(f"Error parsing YAML file: {e}")
+
+        backends = []
+        for i, entry in enumerate(conf.get("backends") or []):
+            name = entry.get("name", f"backend-{i + 1}")
+            api_key = entry.get("api_key") or os.environ.get(
+                entry.get("api_key_env", "OPENAI_KEY"))
+            if not api_key:
+                raise ValueError(
+                    f"Backend '{name}' has no API key configured.")
+            backends.append(Backend(name, api_key, entry.get("base_url"),
+                                    float(entry.get("weight", 1.0))))
+        return cls(backends)
+
+    def _acquire(self, tried: List[Backend]) -> Optional[Backend]:
+        with self._lock:
+            candidates = [b for b in self.backends if b not in tried]
+            if not candidates:
+                return None
+            now = self._clock()
+            healthy = [b for b in candidates if b.healthy(now)]
+            if healthy:
+                backend = min(healthy, key=lambda b: (
+                    b.outstanding / b.weight, b.requests / b.weight))
+            else:
+                backend = min(candidates, key=lambda b: b.unhealthy_until)
+            backend.outstanding += 1
+            backend.requests += 1
+            return backend
+
+    def _release(self, backend: Backend, latency: Optional[float]):
+        with self._lock:
+            backend.outstanding -= 1
+            if latency is None:
+                backend.record_error(self._clock())
+            else:
+                backend.record_success(latency)
+
+    def call(self, fn: Callable[[OpenAI], T],
+             deadline: Optional[Deadline] = None) -> T:
+        """
+        Runs `fn` with a backend's client, failing over to the others on
+        errors.
+
+        When a deadline is given, each attempt's client is bounded by the
+        time remaining at that attempt, and failover stops once it runs out.
+
+        Args:
+            fn (Callable[[OpenAI], T]): The request to make with the given
+                client.
+            deadline (Optional[Deadline]): The deadline the call must finish
+                by, across all attempts.
+
+        Returns:
+            T: The result from the first backend that succeeds.
+
+        Raises:
+            DeadlineExceeded: If the deadline runs out before a backend
+                succeeds.
+            Exception: The last error raised when every backend fails, or the
+                first error that would fail on any backend.
+        """
+        tried = []
+        error = None
+        while True:
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded(
+                    "Deadline exceeded before a backend succeeded."
+                ) from error
+            backend = self._acquire(tried)
+            if backend is None:
+                raise error
+            tried.append(backend)
+            client = backend.client()
+            if deadline is not None:
+                client = client.with_options(timeout=deadline.remaining())
+            start = self._clock()
+            try:
+                result = fn(client)
+            except NON_FAILOVER_ERRORS:
+                self._release(backend, self._clock() - start)
+                raise
+            except Exception as e:
+                self._release(backend, None)
+                logging.warning(
+                    f"Backend '{backend.name}' failed, failing over: {e}")
+                error = e
+                continue
+            self._release(backend, self._clock() - start)
+            return result
+
+    def stats(self) -> List[Dict[str, object]]:
+        """Returns per-backend latency and error stats."""
+        with self._lock:
+            now = self._clock()
+            return [backend.stats(now) for backend in self.backends]
@@ -0,0 +1,76 @@
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage or call has no time left in its budget."""
+
+
+class Deadline:
+    """
+    An absolute point in time that work must finish by.
+
+    Deadlines are measured on the monotonic clock so they are unaffected by
+    wall-clock changes. A stage takes a share of the parent's remaining time
+    with `child()`, and every HTTP or LLM call is given `remaining()` as its
+    timeout.
+    """
+
+    def __init__(self, seconds: float, _clock=time.monotonic):
+        if seconds < 0:
+            raise ValueError(
+                "Deadline must not be a negative number of seconds.")
+        self._clock = _clock
+        self.expires_at = _clock() + seconds
+
+    def remaining(self) -> float:
+        """Returns the seconds left before the deadline, never below zero."""
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        """Returns True once the deadline has passed."""
+        return self.remaining() <= 0
+
+    def check(self, what: str = "operation") -> float:
+        """
+        Returns the remaining time, raising if none is left.
+
+        Args:
+            what (str): A description of the work about to start, used in
+                the error.
+
+        Returns:
+            float: The seconds left before the deadline.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before {what}.")
+        return remaining
+
+    def child(self, fraction: float) -> "Deadline":
+        """
+        Creates a deadline for a sub-stage holding `fraction` of the
+        remaining time.
+
+        Args:
+            fraction (float): The share of the remaining time, in (0, 1].
+
+        Returns:
+            Deadline: A deadline that never outlives this one.
+        """
+        if not 0 < fraction <= 1:
+            raise ValueError("`fraction` must be in the range (0, 1].")
+        return Deadline(self.remaining() * fraction, _clock=self._clock)
+
+
+def remaining_or_none(deadline: Optional[Deadline]) -> Optional[float]:
+    """
+    Returns the time left on `deadline`, or None (no timeout) when there is
+    none.
+    """
+    if deadline is None:
+        return None
+    return deadline.check("call")
@@ -0,0 +1,173 @@
+import argparse
+import logging
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+from scraper import scrape_feeds
+from summarizer import estimate_tokens
+
+# Set up logging
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s - %(levelname)s - %(module)s - "
+                           "%(message)s")
+
+# Column order of a feed table
+FEED_TABLE_COLUMNS = ["feed", "title", "guid", "tags", "published",
+                      "content_length", "est_tokens"]
+
+
+def build_feed_table(feeds: Dict[str, List[Dict[str, object]]]
+                     ) -> pd.DataFrame:
+    """
+    Builds a columnar table of feed items from parsed article records.
+
+    The article bodies are not kept; only their length and estimated token
+    count, so the table stays small enough to plan batches over thousands of
+    articles.
+
+    Args:
+        feeds (Dict[str, List[Dict[str, object]]]): Article records keyed by
+            feed URL, as returned by `scraper.scrape_feeds`.
+
+    Returns:
+        pd.DataFrame: One row per article with the columns in
+            `FEED_TABLE_COLUMNS`.
+    """
+    rows = [
+        {
+            "feed": feed,
+            "title": record["title"],
+            "guid": record["link"],
+            "tags": list(record["tags"]),
+            "published": record.get("published"),
+            "content_length": len(record["article_content"]),
+            "est_tokens": estimate_tokens(record["article_content"]),
+        }
+        for feed, records in feeds.items()
+        for record in records
+    ]
+    table = pd.DataFrame(rows, columns=FEED_TABLE_COLUMNS)
+    table["published"] = pd.to_datetime(table["published"], utc=True,
+                                        errors="coerce", format="mixed")
+    table["content_length"] = table["content_length"].astype("int64")
+    table["est_tokens"] = table["est_tokens"].astype("int64")
+    return table
+
+
+def scrape_feed_table(feed_urls: List[str], max_workers: Optional[int] = None,
+                      timeout: Optional[float] = None) -> pd.DataFrame:
+    """
+    Scrapes RSS feeds and returns their items as a columnar table.
+
+    Args:
+        feed_urls (List[str]): The URLs of the RSS feeds to scrape.
+        max_workers (Optional[int]): How many worker processes to parse with.
+        timeout (Optional[float]): Seconds to wait for each feed request.
+
+    Returns:
+        pd.DataFrame: The feed table.
+    """
+    return build_feed_table(scrape_feeds(feed_urls, max_workers, timeout))
+
+
+def save_feed_table(table: pd.DataFrame, path: str):
+    """Writes a feed table to a Parquet file."""
+    table.to_parquet(path, index=False)
+    logging.info(f"Saved {len(table)} feed item(s) to {path}")
+
+
+def load_feed_table(path: str) -> pd.DataFrame:
+    """Reads a feed table written by `save_feed_table`."""
+    table = pd.read_parquet(path)
+    # Parquet round-trips list columns as arrays
+    table["tags"] = table["tags"].map(list)
+    return table
+
+
+def filter_by_tag(table: pd.DataFrame, tag: str) -> pd.DataFrame:
+    """
+    Returns the articles carrying `tag` (case-insensitive).
+
+    Args:
+        table (pd.DataFrame): A feed table.
+        tag (str): The tag to match.
+
+    Returns:
+        pd.DataFrame: The matching rows.
+    """
+    tags = table["tags"].explode().str.lower()
+    has_tag = tags.eq(tag.lower()).groupby(level=0).any()
+    return table[has_tag.reindex(table.index, fill_value=False)]
+
+
+def unposted_since(table: pd.DataFrame, since: Optional[str] = None,
+                   posted_guids: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    Returns articles not yet posted, optionally only those published since a
+    date.
+
+    Args:
+        table (pd.DataFrame): A feed table.
+        since (Optional[str]): Keep articles published on or after this
+            date.
+        posted_guids (Iterable[str]): Guids (links) of articles already
+            posted, e.g. from `sinks.read_result_links`.
+
+    Returns:
+        pd.DataFrame: The matching rows, newest first.
+    """
+    mask = ~table["guid"].isin(set(posted_guids))
+    if since is not None:
+        mask &= table["published"] >= pd.Timestamp(since, tz="UTC")
+    return table[mask].sort_values("published", ascending=False)
+
+
+def longest(table: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Returns the `n` articles with the most estimated tokens."""
+    return table.nlargest(n, "est_tokens")
+
+
+def shortest(table: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Returns the `n` articles with the fewest estimated tokens."""
+    return table.nsmallest(n, "est_tokens")
+
+
+def estimate_writer_prompt_tokens(table: pd.DataFrame,
+                                  token_budget: Optional[int] = None,
+                                  calls_per_article: int = 3) -> int:
+    """
+    Estimates the article tokens sent to the writer to post every article in
+    `table`.
+
+    This counts writer prompt tokens only. It does not include the
+    summarization map and reduce calls made for articles over
+    `token_budget`, the reviewer prompt, the system prompts or any completion
+    tokens, so it is a lower bound on a batch's total token spend.
+
+    Args:
+        table (pd.DataFrame): The articles to post.
+        token_budget (Optional[int]): Articles above this are drafted from a
+            brief, counted here at this size as an upper bound on the brief.
+        calls_per_article (int): Writer calls made per article (one per
+            draft).
+
+    Returns:
+        int: The estimated writer prompt tokens.
+    """
+    tokens = table["est_tokens"]
+    if token_budget is not None:
+        tokens = tokens.clip(upper=token_budget)
+    return int(tokens.sum()) * calls_per_article
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Scrape Medium feeds into a Parquet feed table.")
+    parser.add_argument("usernames", nargs="+",
+                        help="Medium usernames whose feeds to scrape")
+    parser.add_argument("--output", default="feed_table.parquet",
+                        help="Parquet file to write")
+    args = parser.parse_args()
+
+    feed_urls = [f"https://medium.com/feed/@{username}"
+                 for username in args.usernames]
+    save_feed_table(scrape_feed_table(feed_urls), args.output)
@@ -0,0 +1,232 @@
+import os
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from typing import Callable, Optional, TypeVar
+
+from deadline import Deadline, DeadlineExceeded
+
+# Set up logging
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s - %(levelname)s - %(module)s - "
+                           "%(message)s")
+
+# Constants
+LATENCY_HISTORY = os.environ.get("LATENCY_HISTORY",
+                                 "./.cache/latency_history.json")
+
+T = TypeVar("T")
+
+
+def _start_attempt(fn: Callable[[], T], name: str) -> "Future[T]":
+    """
+    Runs `fn` on a daemon thread and returns a future for its result.
+
+    A thread pool's workers are joined at interpreter exit, so a losing
+    attempt still waiting on the network would hold the process open until
+    its request timed out. Daemon threads are not waited for.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name=f"hedged-{name}", daemon=True).start()
+    return future
+
+
+class HedgedCaller:
+    """
+    Sends a duplicate request when the first one is slower than usual.
+
+    The caller keeps a window of recent latencies. If a call has not answered
+    by the configured percentile of that window, an identical call is started
+    and whichever succeeds first wins. Hedges are a spend budget of at most
+    `max_hedge_ratio` of all calls. The call and hedge counts are saved with
+    the latencies, so the budget holds across runs and not just within one
+    process; at a ratio of 0.1 the first hedge is allowed on the tenth call.
+
+    Each attempt runs on a daemon thread. The attempt that loses is abandoned
+    rather than cancelled: it runs on in the background until its request
+    returns or times out, but it never delays the caller or process exit.
+
+    Args:
+        percentile (float): The latency percentile (0-100) after which to
+            hedge.
+        max_hedge_ratio (float): The maximum number of hedges as a fraction of
+            calls. 0 disables hedging.
+        window (int): How many recent latencies to keep.
+        min_samples (int): How many latencies to observe before hedging at
+            all.
+        name (str): A label used in log messages and the history file.
+    """
+
+    def __init__(self, percentile: float = 95.0, max_hedge_ratio: float = 0.1,
+                 window: int = 50, min_samples: int = 2, name: str = "call"):
+        if not 0 < percentile <= 100:
+            raise ValueError("`percentile` must be in the range (0, 100].")
+        if max_hedge_ratio < 0:
+            raise ValueError("`max_hedge_ratio` must not be negative.")
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = max(1, min_samples)
+        self.name = name
+        self.calls = 0
+        self.hedges = 0
+        # The part of `calls`/`hedges` already counted in the history file
+        self._saved_calls = 0
+        self._saved_hedges = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        """Adds an observed latency, in seconds, to the window."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Returns how long to wait before hedging, or None if there is too
+        little history.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        position = self.percentile / 100 * (len(ordered) - 1)
+        return ordered[min(len(ordered) - 1, int(round(position)))]
+
+    def _take_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.max_hedge_ratio * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def load_history(self, path: str):
+        """
+        Seeds the latency window and the hedge budget's call and hedge
+        counts from a history file written by `save_history`, so a new
+        process does not start without history.
+
+        Args:
+            path (str): The JSON history file. A missing or unreadable file
+                is ignored.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as history_file:
+                entry = json.load(history_file).get(self.name) or {}
+            latencies = [float(latency)
+                         for latency in entry.get("latencies", [])]
+            calls = int(entry.get("calls", 0))
+            hedges = int(entry.get("hedges", 0))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable latency history at {path}: "
+                            f"{e}")
+            return
+        with self._lock:
+            self._latencies.extend(latencies)
+            self.calls += calls
+            self.hedges += hedges
+            self._saved_calls += calls
+            self._saved_hedges += hedges
+
+    def save_history(self, path: str):
+        """
+        Writes the latency window and call and hedge counts to `path` under
+        this caller's name, keeping the entries of other callers.
+
+        Only the calls and hedges made since the last load or save are added
+        to the counts in the file, so runs sharing the file do not overwrite
+        each other's spend.
+
+        Args:
+            path (str): The JSON history file.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as history_file:
+                history = json.load(history_file)
+        except (OSError, ValueError):
+            history = {}
+        if not isinstance(history, dict):
+            history = {}
+        entry = history.get(self.name)
+        if not isinstance(entry, dict):
+            entry = {}
+        with self._lock:
+            calls = int(entry.get("calls", 0)) + self.calls \
+                - self._saved_calls
+            hedges = int(entry.get("hedges", 0)) + self.hedges \
+                - self._saved_hedges
+            history[self.name] = {"latencies": list(self._latencies),
+                                  "calls": calls, "hedges": hedges}
+            self.calls, self.hedges = calls, hedges
+            self._saved_calls, self._saved_hedges = calls, hedges
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as history_file:
+            json.dump(history, history_file)
+        os.replace(tmp_path, path)
+
+    def call(self, fn: Callable[[], T],
+             deadline: Optional[Deadline] = None) -> T:
+        """
+        Runs `fn`, hedging it with a duplicate if it is slow.
+
+        Args:
+            fn (Callable[[], T]): The request to make. It may be invoked twice.
+            deadline (Optional[Deadline]): The deadline the call must finish
+                by.
+
+        Returns:
+            T: The result of whichever invocation succeeded first.
+
+        Raises:
+            DeadlineExceeded: If no invocation succeeds before the deadline.
+            Exception: The last error raised when every invocation fails.
+        """
+        if deadline is not None:
+            deadline.check(f"{self.name} call")
+        with self._lock:
+            self.calls += 1
+
+        start = time.monotonic()
+        futures = {_start_attempt(fn, self.name)}
+        delay = self.hedge_delay()
+        in_budget = deadline is None or delay is None \
+            or delay < deadline.remaining()
+        if delay is not None and in_budget:
+            done, _ = wait(futures, timeout=delay)
+            if not done and self._take_hedge():
+                logging.info("%s slower than p%g (%.2fs); sending hedged "
+                             "request.", self.name, self.percentile, delay)
+                futures.add(_start_attempt(fn, self.name))
+
+        error = None
+        pending = futures
+        while pending:
+            timeout = deadline.remaining() if deadline is not None else None
+            done, pending = wait(pending, timeout=timeout,
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(
+                    f"Deadline exceeded waiting for {self.name}.")
+            for future in done:
+                if future.exception() is None:
+                    self.record(time.monotonic() - start)
+                    return future.result()
+                error = future.exception()
+        raise error
@@ -1,9 +1,21 @@
 import argparse
 import logging
+import time
+from datetime import datetime, timezone
 from scraper import scrape_article
 from writer import write_post_openai
 from reviewer import review_drafts_openai
-from typing import List, Dict
+from deadline import Deadline, remaining_or_none
+from hedging import HedgedCaller, LATENCY_HISTORY
+from backends import BackendPool
+from sinks import ResultSink, open_sink
+from summarizer import (
+    SUMMARY_CACHE,
+    SummaryCache,
+    build_article_brief,
+    estimate_tokens,
+)
+from typing import List, Dict, Optional
 
 # Configure logging
 logging.basicConfig(
@@ -13,14 +25,88 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+NUM_DRAFTS = 3
+
+# Articles estimated above this many tokens are condensed into a brief
+# before drafting
+WRITER_TOKEN_BUDGET = 6000
+
+# Share of the end-to-end deadline given to each stage, in pipeline order
+STAGE_BUDGETS = {
+    "scrape": 0.1,
+    "summarize": 0.2,
+    "draft": 0.45,
+    "review": 0.25,
+}
+
+# Hedgers live for the whole process so latency history builds up across
+# runs instead of starting empty for every article
+_HEDGERS: Dict[str, HedgedCaller] = {}
+
+
+def get_hedger(name: str, percentile: float,
+               max_hedge_ratio: float) -> HedgedCaller:
+    """
+    Returns the process-wide hedger for `name`, creating it on first use.
+
+    A new hedger is seeded from `LATENCY_HISTORY` so that even the first run
+    in a process has recent latencies to hedge against, and its hedge budget
+    counts the calls and hedges of earlier runs.
+
+    Args:
+        name (str): The call being hedged, e.g. "draft" or "review".
+        percentile (float): The latency percentile after which to hedge.
+        max_hedge_ratio (float): The maximum share of calls that may be
+            hedged.
 
-def scrape_medium_article(feed: str, article_title: str) -> Dict[str, str]:
+    Returns:
+        HedgedCaller: The hedger, updated to the given settings.
+    """
+    hedger = _HEDGERS.get(name)
+    if hedger is None:
+        hedger = HedgedCaller(percentile, max_hedge_ratio, name=name)
+        hedger.load_history(LATENCY_HISTORY)
+        _HEDGERS[name] = hedger
+    hedger.percentile = percentile
+    hedger.max_hedge_ratio = max_hedge_ratio
+    return hedger
+
+
+def stage_deadline(deadline: Optional[Deadline],
+                   stage: str) -> Optional[Deadline]:
+    """
+    Carves the budget for `stage` out of the remaining end-to-end deadline.
+
+    Each stage receives its weight relative to the stages still to run, so
+    time an earlier stage did not use rolls over to later ones.
+
+    Args:
+        deadline (Optional[Deadline]): The end-to-end deadline, if any.
+        stage (str): A key of `STAGE_BUDGETS`.
+
+    Returns:
+        Optional[Deadline]: The stage deadline, or None when there is no
+        deadline.
+    """
+    if deadline is None:
+        return None
+    stages = list(STAGE_BUDGETS)
+    still_to_run = sum(
+        STAGE_BUDGETS[s] for s in stages[stages.index(stage):])
+    return deadline.child(STAGE_BUDGETS[stage] / still_to_run)
+
+
+def scrape_medium_article(feed: str, article_title: str,
+                          deadline: Optional[Deadline] = None
+                          ) -> Dict[str, str]:
     """
     Scrapes a Medium article using the feed URL and article title.
 
     Args:
         feed (str): The RSS feed URL of the Medium user.
         article_title (str): The title of the article to scrape.
+        deadline (Optional[Deadline]): The deadline the request must finish
+        by.
 
     Returns:
         Dict[str, str]: A dictionary containing article metadata such as title
@@ -31,7 +117,8 @@ def scrape_medium_article(feed: str, article_title: str) -> Dict[str, str]:
         fields.
     """
     try:
-        article_data = scrape_article(feed, article_title)
+        article_data = scrape_article(feed, article_title,
+                                      timeout=remaining_or_none(deadline))
         if not article_data:
             error = f"Article '{article_title}' not found in feed: {feed}"
             raise ValueError(error)
@@ -41,12 +128,59 @@ def scrape_medium_article(feed: str, article_title: str) -> Dict[str, str]:
         raise
 
 
-def create_post_draft(article_text: str) -> str:
+def prepare_article_text(title: str, text: str,
+                         token_budget: int = WRITER_TOKEN_BUDGET,
+                         deadline: Optional[Deadline] = None,
+                         pool: Optional[BackendPool] = None) -> str:
+    """
+    Builds the text the writer drafts from, condensing articles that are too
+    long.
+
+    Articles within `token_budget` are passed through whole. Longer ones are
+    reduced to a brief by a map-reduce summary, computed once and shared by
+    every draft.
+
+    Args:
+        title (str): The article title.
+        text (str): The article content.
+        token_budget (int): The estimated token count above which to
+        summarize.
+        deadline (Optional[Deadline]): The deadline summarization must finish
+        by.
+        pool (Optional[BackendPool]): Backends to route summary calls across,
+        if given.
+
+    Returns:
+        str: The title and either the full article or its brief.
+    """
+    article_text = f"{title}\n{text}"
+    article_tokens = estimate_tokens(article_text)
+    if article_tokens <= token_budget:
+        return article_text
+
+    logger.info("Article is ~%d tokens (budget %d); building a brief.",
+                article_tokens, token_budget)
+    try:
+        return build_article_brief(title, text, SummaryCache(SUMMARY_CACHE),
+                                   deadline=deadline, pool=pool)
+    except Exception as e:
+        logger.error("Error summarizing article: %s", e)
+        raise
+
+
+def create_post_draft(article_text: str, deadline: Optional[Deadline] = None,
+                      hedger: Optional[HedgedCaller] = None,
+                      pool: Optional[BackendPool] = None) -> str:
     """
     Creates a draft post from the given article text using OpenAI's API.
 
     Args:
         article_text (str): The text content of the article.
+        deadline (Optional[Deadline]): The deadline the draft must finish by.
+        hedger (Optional[HedgedCaller]): Hedges the call when it is slow, if
+        given.
+        pool (Optional[BackendPool]): Backends to route the call across, if
+        given.
 
     Returns:
         str: A draft LinkedIn post body generated from the article.
@@ -55,18 +189,29 @@ def create_post_draft(article_text: str) -> str:
         RuntimeError: If the draft cannot be created.
     """
     try:
-        return write_post_openai(article_text)
+        def call():
+            return write_post_openai(article_text, deadline=deadline,
+                                     pool=pool)
+
+        return hedger.call(call, deadline) if hedger else call()
     except Exception as e:
         logger.error("Error creating post draft: %s", e)
         raise
 
 
-def rank_post_drafts(drafts: List[str]) -> str:
+def rank_post_drafts(drafts: List[str], deadline: Optional[Deadline] = None,
+                     hedger: Optional[HedgedCaller] = None,
+                     pool: Optional[BackendPool] = None) -> str:
     """
     Ranks multiple draft posts and selects the best one using OpenAI's API.
 
     Args:
         drafts (List[str]): A list of draft posts.
+        deadline (Optional[Deadline]): The deadline the review must finish by.
+        hedger (Optional[HedgedCaller]): Hedges the call when it is slow, if
+        given.
+        pool (Optional[BackendPool]): Backends to route the call across, if
+        given.
 
     Returns:
         str: The highest-ranked draft post.
@@ -75,7 +220,11 @@ def rank_post_drafts(drafts: List[str]) -> str:
         RuntimeError: If ranking fails.
     """
     try:
-        return review_drafts_openai(drafts)
+        def call():
+            return review_drafts_openai(drafts, deadline=deadline,
+                                        pool=pool)
+
+        return hedger.call(call, deadline) if hedger else call()
     except Exception as e:
         logger.error("Error ranking drafts: %s", e)
         raise
@@ -108,40 +257,134 @@ def add_boilerplate(post_body: str, tags: List[str], article_url: str) -> str:
         raise
 
 
-def main(feed: str, article_title: str):
+def selected_draft_index(drafts: List[str],
+                         final_draft: str) -> Optional[int]:
+    """
+    Finds which draft the reviewer chose.
+
+    The reviewer is asked to return the best post word for word, so the
+    choice is matched on whitespace-trimmed text.
+
+    Args:
+        drafts (List[str]): The draft posts that were reviewed.
+        final_draft (str): The post the reviewer returned.
+
+    Returns:
+        Optional[int]: The index of the chosen draft, or None if the
+        reviewer's output does not match any draft exactly.
+    """
+    chosen = final_draft.strip()
+    for i, draft in enumerate(drafts):
+        if draft.strip() == chosen:
+            return i
+    return None
+
+
+def main(feed: str, article_title: str,
+         deadline_seconds: Optional[float] = None,
+         hedge_percentile: Optional[float] = None,
+         max_hedge_ratio: float = 0.1,
+         backends_config: Optional[str] = None,
+         sink: Optional[ResultSink] = None,
+         token_budget: int = WRITER_TOKEN_BUDGET):
     """
     Main function to scrape a Medium article and create a draft post.
 
     Args:
         feed (str): The RSS feed URL of the Medium user.
         article_title (str): The title of the article to scrape.
+        deadline_seconds (Optional[float]): End-to-end time limit for the run,
+        split across stages by `STAGE_BUDGETS`. Defaults to no limit.
+        hedge_percentile (Optional[float]): Latency percentile after which a
+        slow draft or review call is duplicated. Defaults to no hedging.
+        max_hedge_ratio (float): The maximum share of calls that may be
+        hedged.
+        backends_config (Optional[str]): Path to a YAML file listing LLM
+        backends to load balance across. Defaults to the single OPENAI_KEY.
+        sink (Optional[ResultSink]): Where to record the article, drafts,
+        choice, final post and timings. Defaults to printing the final post
+        only.
+        token_budget (int): Articles estimated above this many tokens are
+        drafted from a summarized brief instead of the full text.
     """
     try:
+        run_start = time.monotonic()
+        timings = {}
+        deadline = Deadline(deadline_seconds) if deadline_seconds else None
+        draft_hedger = review_hedger = None
+        if hedge_percentile is not None:
+            draft_hedger = get_hedger("draft", hedge_percentile,
+                                      max_hedge_ratio)
+            review_hedger = get_hedger("review", hedge_percentile,
+                                       max_hedge_ratio)
+        pool = None
+        if backends_config:
+            pool = BackendPool.from_config(backends_config)
+
         logger.info("Scraping article: %s from feed: %s", article_title, feed)
-        article_data = scrape_medium_article(feed, article_title)
+        article_data = scrape_medium_article(
+            feed, article_title, stage_deadline(deadline, "scrape"))
+        timings["scrape"] = time.monotonic() - run_start
 
         title = article_data.get("title")
         tags = article_data.get("tags", [])
         text = article_data.get("article_content", "")
         link = article_data.get("link", "")
 
-        article_text = f"{title}\n{text}"
+        summarize_start = time.monotonic()
+        article_text = prepare_article_text(
+            title, text, token_budget, stage_deadline(deadline, "summarize"),
+            pool)
+        timings["summarize"] = time.monotonic() - summarize_start
 
-        # Create draft post bodies
+        # Create draft post bodies, splitting the draft budget evenly between
+        # them
         drafts = []
-        for i in range(3):
+        timings["drafts"] = []
+        draft_stage = stage_deadline(deadline, "draft")
+        for i in range(NUM_DRAFTS):
             logger.info("Generating draft #%d", i + 1)
-            draft_post_body = create_post_draft(article_text)
+            draft_deadline = None
+            if draft_stage:
+                draft_deadline = draft_stage.child(1 / (NUM_DRAFTS - i))
+            draft_start = time.monotonic()
+            draft_post_body = create_post_draft(article_text, draft_deadline,
+                                                draft_hedger, pool)
+            timings["drafts"].append(time.monotonic() - draft_start)
             drafts.append(draft_post_body)
 
         # Grab the best one
-        final_draft = rank_post_drafts(drafts)
+        review_start = time.monotonic()
+        final_draft = rank_post_drafts(
+            drafts, stage_deadline(deadline, "review"), review_hedger, pool)
+        timings["review"] = time.monotonic() - review_start
         logger.info("Best draft selected.")
 
         # Add boilerplate to it
         final_post = add_boilerplate(final_draft, tags, link)
         logger.info("Final post created.")
 
+        for hedger in (draft_hedger, review_hedger):
+            if hedger:
+                hedger.save_history(LATENCY_HISTORY)
+
+        if pool:
+            for backend_stats in pool.stats():
+                logger.info("Backend stats: %s", backend_stats)
+
+        timings["total"] = time.monotonic() - run_start
+        if sink:
+            sink.write({
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "title": title,
+                "link": link,
+                "tags": tags,
+                "drafts": drafts,
+                "selected_index": selected_draft_index(drafts, final_draft),
+                "final_post": final_post,
+                "timings": timings,
+            })
+
         print("!------------------ Final Post ------------------!")
         print(final_post)
         print("\n")
@@ -155,10 +398,30 @@ if __name__ == "__main__":
     description = "Scrape a Medium article and generate draft posts."
     article_title_help = "The title of the article to scrape"
     username_help = "The title of the article to scrape"
+    deadline_help = "End-to-end time limit for the run, in seconds"
+    hedge_percentile_help = ("Hedge draft/review calls slower than this "
+                             "latency percentile (e.g. 95)")
+    max_hedge_ratio_help = "Maximum share of calls that may be hedged"
+    token_budget_help = ("Summarize articles estimated above this many "
+                         "tokens before drafting")
+    output_help = "Record results to a .jsonl file or .db/.sqlite database"
+    backends_help = ("YAML file listing LLM backends to load balance across "
+                     "(see config/backends_sample.yml)")
 
     parser = argparse.ArgumentParser(description=description)
     parser.add_argument("article_title", type=str, help=article_title_help)
     parser.add_argument("username", type=str, help=username_help)
+    parser.add_argument("--deadline", type=float, default=None,
+                        help=deadline_help)
+    parser.add_argument("--hedge-percentile", type=float, default=None,
+                        help=hedge_percentile_help)
+    parser.add_argument("--max-hedge-ratio", type=float, default=0.1,
+                        help=max_hedge_ratio_help)
+    parser.add_argument("--backends", type=str, default=None,
+                        help=backends_help)
+    parser.add_argument("--output", type=str, default=None, help=output_help)
+    parser.add_argument("--token-budget", type=int,
+                        default=WRITER_TOKEN_BUDGET, help=token_budget_help)
 
     # Parse the arguments
     args = parser.parse_args()
@@ -167,4 +430,10 @@ if __name__ == "__main__":
     feed = f"https://medium.com/feed/@{args.username}"
 
     # Call the main function with arguments
-    main(feed, args.article_title)
+    sink = open_sink(args.output) if args.output else None
+    try:
+        main(feed, args.article_title, args.deadline, args.hedge_percentile,
+             args.max_hedge_ratio, args.backends, sink, args.token_budget)
+    finally:
+        if sink:
+            sink.close()
@@ -0,0 +1,54 @@
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s - %(levelname)s - %(module)s - "
+                           "%(message)s")
+
+
+def _usage_count(usage, *path: str) -> int:
+    """Walks `path` on a usage object and returns the count found, or 0."""
+    value = usage
+    for attr in path:
+        value = getattr(value, attr, None)
+        if value is None:
+            return 0
+    return value if isinstance(value, int) else 0
+
+
+def cached_prompt_tokens(response) -> int:
+    """
+    Returns the number of prompt tokens the provider served from its prompt
+    cache.
+
+    OpenAI reports this as `usage.prompt_tokens_details.cached_tokens`.
+    Responses without usage details (older SDKs, compatible endpoints) count
+    as zero.
+
+    Args:
+        response: A chat completions response object.
+
+    Returns:
+        int: The number of cached prompt tokens.
+    """
+    return _usage_count(response, "usage", "prompt_tokens_details",
+                        "cached_tokens")
+
+
+def log_prompt_cache_usage(response, call_name: str) -> int:
+    """
+    Logs how much of a call's prompt was a provider-side cache hit.
+
+    Args:
+        response: A chat completions response object.
+        call_name (str): A label for the call, e.g. "writer" or
+            "reviewer".
+
+    Returns:
+        int: The number of cached prompt tokens.
+    """
+    cached = cached_prompt_tokens(response)
+    prompt_tokens = _usage_count(response, "usage", "prompt_tokens")
+    logging.info("%s prompt cache: %d/%d prompt tokens cached.", call_name,
+                 cached, prompt_tokens)
+    return cached
@@ -1,8 +1,11 @@
 import os
 import logging
-from typing import List
+from typing import List, Optional
 import yaml
 from openai import OpenAI
+from prompt_cache import log_prompt_cache_usage
+from backends import BackendPool
+from deadline import Deadline
 
 # Configure logging
 logging.basicConfig(
@@ -11,9 +14,39 @@ logging.basicConfig(
 
 # Constants
 YML_CONFIG = os.environ.get("YML_CONFIG", "./config/system_prompts.yml")
+REVIEWER_INSTRUCTION = ("Given the three posts above (each between the <post> "
+                        "tags) output the best post word for word.")
 
 
-def review_drafts_openai(posts: List[str]) -> str:
+def build_reviewer_messages(system_message: str, posts: List[str],
+                            instruction: str = REVIEWER_INSTRUCTION) -> list:
+    """Builds the chat messages for a reviewer call with a prompt-cache
+    friendly layout.
+
+    The static system prompt leads, the drafts follow, and the instruction sits
+    at the tail so that repeated reviews of the same drafts share a cacheable
+    prefix.
+
+    Args:
+        system_message (str): The reviewer system prompt.
+        posts (List[str]): The draft posts to judge.
+        instruction (str): The per-call instruction appended after the drafts.
+
+    Returns:
+        list: The messages to send to the chat completions API.
+    """
+    drafts = "\n\n".join(f"# POST #{i} <post> {post} </post>"
+                         for i, post in enumerate(posts, start=1))
+    user_message = f"{drafts}\n\n{instruction}"
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_message}
+    ]
+
+
+def review_drafts_openai(posts: List[str],
+                         deadline: Optional[Deadline] = None,
+                         pool: Optional[BackendPool] = None) -> str:
     """Selects the best post from three provided drafts using OpenAI's
     GPT model.
 
@@ -23,6 +56,10 @@ def review_drafts_openai(posts: List[str]) -> str:
 
     Args:
         posts (List[str]): A list of three draft posts as strings.
+        deadline (Optional[Deadline]): The deadline the API call must finish
+        by. Defaults to the client's timeout.
+        pool (Optional[BackendPool]): Backends to route the call across.
+        Defaults to a single client using the OPENAI_KEY environment variable.
 
     Returns:
         str: The best post as determined by the GPT model.
@@ -34,9 +71,9 @@ def review_drafts_openai(posts: List[str]) -> str:
         KeyError: If the `reviewer_system_message` key is missing in the YAML
         file. Exception: If an error occurs during the API call.
     """
-    # Validate API key
+    # Validate API key, unless a backend pool supplies the keys
     openai_api_key = os.environ.get("OPENAI_KEY")
-    if not openai_api_key:
+    if pool is None and not openai_api_key:
         logging.error("OPENAI_KEY is not set in environment variables.")
         error = """Missing API key for OpenAI. Set the OPENAI_KEY
         environment variable."""
@@ -71,35 +108,34 @@ def review_drafts_openai(posts: List[str]) -> str:
 
     logging.info("System message loaded successfully.")
 
-    # Construct user message
-    user_message = (
-        f"""Given the three posts below (each between the <post> tags) output
-        the best post word for word.
-
-        # POST #1 <post> {posts[0]} <post>
-
-        # POST #2 <post> {posts[1]} <post>
-
-        # POST #3 <post> {posts[2]} <post>"""
-    )
+    # Construct messages
+    messages = build_reviewer_messages(system_message, posts)
 
     try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=openai_api_key)
-
-        # Send API request
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ]
-        )
+        def create(client):
+            return client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages
+            )
+
+        # Send API request through the pool, or a client for the single key
+        if pool is None:
+            client = OpenAI(api_key=openai_api_key)
+            if deadline is not None:
+                # Retries would run past the deadline, so a bounded call
+                # gets one attempt
+                client = client.with_options(timeout=deadline.check("call"),
+                                             max_retries=0)
+            response = create(client)
+        else:
+            response = pool.call(create, deadline)
 
         # Check if response is valid
         if not response.choices or not response.choices[0].message or not response.choices[0].message.content:
             raise ValueError("Invalid response format from OpenAI API.")
 
+        log_prompt_cache_usage(response, "reviewer")
+
         best_post = response.choices[0].message.content
         logging.info("Successfully retrieved best post from OpenAI.")
 
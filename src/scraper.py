@@ -1,4 +1,7 @@
+import os
 import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
 from bs4 import BeautifulSoup
 from bs4.builder import XMLParsedAsHTMLWarning
 import warnings
@@ -6,50 +9,134 @@ import warnings
 warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
 
 
-def scrape_article(feed_url: str, article: str):
+def parse_feed(feed_text: str) -> List[Dict[str, object]]:
     """
-    Scrapes an RSS feed and extracts articles, including titles, tags, and content.
-    Optionally filters and returns details for a specific article based on its title.
+    Parses an RSS feed document into plain article records.
+
+    The records hold only strings and lists, so they are cheap to pickle and
+    can be returned from a worker process instead of BeautifulSoup objects.
 
     Args:
-        feed_url (str): The URL of the RSS feed to scrape.
-        article (str): The title of the article to filter. Defaults to None.
+        feed_text (str): The raw RSS feed document.
 
     Returns:
         list[dict]: A list of dictionaries, each containing:
             - "title" (str): The title of the article.
-            - "tags" (list[str]): A list of tags (categories) associated with the article.
+            - "tags" (list[str]): A list of tags (categories) associated
+              with the article.
             - "article_content" (str): The full content of the article.
-            If `article` is provided, the list will contain at most one dictionary for the matching article.
+            - "link" (str): The article's guid, which is its URL.
+            - "published" (str | None): The article's RSS pubDate, if present.
     """
-    # Send a GET request to the RSS feed URL
-    r = requests.get(feed_url)
-
     # Parse the response using BeautifulSoup
-    soup = BeautifulSoup(r.text, 'html.parser')
+    soup = BeautifulSoup(feed_text, 'html.parser')
 
     # Clean up content by removing CDATA markers
     content = str(soup).replace('<![CDATA[', '').replace(']]>', '')
     content = BeautifulSoup(content, 'html.parser')
 
     # Find all article entries in the feed
-    articles = content.find_all('item')
-
-    for article_entry in articles:
+    records = []
+    for article_entry in content.find_all('item'):
 
         title = article_entry.find('title').text
         tags = [tag.text for tag in article_entry.find_all('category')]
         article_content = article_entry.find('content:encoded').text
         link = article_entry.find('guid').text
+        pub_date = article_entry.find('pubdate')
 
-        article_dict = {
+        records.append({
             "title": title,
             "tags": tags,
             "article_content": article_content,
-            "link": link
-        }
+            "link": link,
+            "published": pub_date.text if pub_date else None
+        })
+
+    return records
+
+
+def parse_feeds(feed_texts: List[str], max_workers: Optional[int] = None
+                ) -> List[List[Dict[str, object]]]:
+    """
+    Parses many RSS feed documents, fanning them out to a process pool.
+
+    BeautifulSoup parsing is CPU-bound pure Python and holds the GIL, so
+    threads do not help; separate processes let every core parse a feed at
+    once.
+
+    Args:
+        feed_texts (List[str]): The raw RSS feed documents.
+        max_workers (Optional[int]): How many worker processes to use.
+            Defaults to the number of CPUs; 1 parses in the current process.
+
+    Returns:
+        list[list[dict]]: The records of each feed, in the order of
+            `feed_texts`.
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(feed_texts))
+    if workers <= 1:
+        return [parse_feed(feed_text) for feed_text in feed_texts]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_feed, feed_texts))
+
+
+def scrape_feeds(feed_urls: List[str], max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None
+                 ) -> Dict[str, List[Dict[str, object]]]:
+    """
+    Downloads RSS feeds concurrently and parses them in a process pool.
+
+    Args:
+        feed_urls (List[str]): The URLs of the RSS feeds to scrape.
+        max_workers (Optional[int]): How many worker processes to parse with.
+            Defaults to the number of CPUs.
+        timeout (Optional[float]): Seconds to wait for each feed request.
+            Defaults to no timeout.
+
+    Returns:
+        dict[str, list[dict]]: The article records of each feed, keyed by
+            feed URL.
+    """
+    def fetch(feed_url: str) -> str:
+        return requests.get(feed_url, timeout=timeout).text
+
+    # Downloads are I/O-bound, so threads are enough for them
+    fetchers = max(1, min(16, len(feed_urls)))
+    with ThreadPoolExecutor(max_workers=fetchers) as executor:
+        feed_texts = list(executor.map(fetch, feed_urls))
+
+    return dict(zip(feed_urls, parse_feeds(feed_texts, max_workers)))
+
+
+def scrape_article(feed_url: str, article: str,
+                   timeout: Optional[float] = None):
+    """
+    Scrapes an RSS feed and extracts articles, including titles, tags, and
+    content. Optionally filters and returns details for a specific article
+    based on its title.
+
+    Args:
+        feed_url (str): The URL of the RSS feed to scrape.
+        article (str): The title of the article to filter. Defaults to None.
+        timeout (Optional[float]): Seconds to wait for the feed request.
+            Defaults to no timeout.
+
+    Returns:
+        list[dict]: A list of dictionaries, each containing:
+            - "title" (str): The title of the article.
+            - "tags" (list[str]): A list of tags (categories) associated
+              with the article.
+            - "article_content" (str): The full content of the article.
+            If `article` is provided, the list will contain at most one
+            dictionary for the matching article.
+    """
+    # Send a GET request to the RSS feed URL
+    r = requests.get(feed_url, timeout=timeout)
 
-        if title == article:
+    for article_dict in parse_feed(r.text):
+        if article_dict["title"] == article:
             return article_dict
 
     return None
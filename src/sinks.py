@@ -0,0 +1,213 @@
+import os
+import json
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+# Set up logging
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s - %(levelname)s - %(module)s - "
+                           "%(message)s")
+
+# Fields every result record carries, in the order they are stored
+RESULT_FIELDS = ("created_at", "title", "link", "tags", "drafts",
+                 "selected_index", "final_post", "timings")
+
+
+class ResultSink(ABC):
+    """
+    Buffers pipeline result records and writes them out in batches.
+
+    Records are held in memory until `batch_size` have accumulated, then
+    written with a single write/transaction, so bulk runs do not pay for a
+    sync per record. Records stay buffered until a write succeeds, so a failed
+    write is retried on the next flush. Call `close()` (or use the sink as a
+    context manager) to flush what is left.
+
+    Args:
+        batch_size (int): How many records to buffer before writing.
+    """
+
+    def __init__(self, batch_size: int = 50):
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be at least 1.")
+        self.batch_size = batch_size
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]):
+        """Buffers a record, flushing once the batch is full."""
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_buffer()
+
+    def flush(self):
+        """Writes any buffered records."""
+        with self._lock:
+            self._flush_buffer()
+
+    def _flush_buffer(self):
+        if not self._buffer:
+            return
+        self._write_batch(list(self._buffer))
+        # Only drop the records once they are safely written
+        self._buffer.clear()
+
+    def close(self):
+        """Flushes buffered records and releases the underlying storage."""
+        self.flush()
+
+    @abstractmethod
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        """Writes a batch of records in one operation."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONLSink(ResultSink):
+    """
+    Appends result records to a JSON Lines file, one object per line.
+
+    Args:
+        path (str): The file to append to.
+        batch_size (int): How many records to buffer before writing.
+        fsync (bool): Whether to fsync after each batch for durability.
+    """
+
+    def __init__(self, path: str, batch_size: int = 50, fsync: bool = True):
+        super().__init__(batch_size)
+        self.path = path
+        self.fsync = fsync
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        self._file.write("".join(json.dumps(record, ensure_ascii=False) + "\n"
+                                 for record in batch))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        logging.info(f"Wrote {len(batch)} result(s) to {self.path}")
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+class SQLiteSink(ResultSink):
+    """
+    Inserts result records into a `results` table of a SQLite database.
+
+    List and dict fields (tags, drafts, timings) are stored as JSON text. Each
+    batch is inserted in one transaction.
+
+    Args:
+        path (str): The database file.
+        batch_size (int): How many records to buffer before writing.
+    """
+
+    def __init__(self, path: str, batch_size: int = 50):
+        super().__init__(batch_size)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL with NORMAL sync commits without an fsync of the main database
+        # per transaction
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT,
+                title TEXT,
+                link TEXT,
+                tags TEXT,
+                drafts TEXT,
+                selected_index INTEGER,
+                final_post TEXT,
+                timings TEXT
+            )"""
+        )
+        self._conn.commit()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        rows = [
+            tuple(
+                json.dumps(record.get(field), ensure_ascii=False)
+                if isinstance(record.get(field), (list, dict))
+                else record.get(field)
+                for field in RESULT_FIELDS
+            )
+            for record in batch
+        ]
+        columns = ", ".join(RESULT_FIELDS)
+        placeholders = ", ".join("?" for _ in RESULT_FIELDS)
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO results ({columns}) VALUES ({placeholders})",
+                rows
+            )
+        logging.info(f"Wrote {len(batch)} result(s) to {self.path}")
+
+    def close(self):
+        super().close()
+        self._conn.close()
+
+
+def open_sink(path: str, batch_size: int = 50) -> ResultSink:
+    """
+    Opens a result sink, choosing the format from the file extension.
+
+    Args:
+        path (str): A `.jsonl` file or a `.db`/`.sqlite`/`.sqlite3`
+            database.
+        batch_size (int): How many records to buffer before writing.
+
+    Returns:
+        ResultSink: The opened sink.
+
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".jsonl":
+        return JSONLSink(path, batch_size)
+    if extension in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteSink(path, batch_size)
+    raise ValueError(f"Unsupported result sink format: '{extension}'. "
+                     "Use .jsonl, .db or .sqlite.")
+
+
+def read_result_links(path: str) -> List[str]:
+    """
+    Reads the article links already recorded in a result file.
+
+    Args:
+        path (str): A `.jsonl` file or a `.db`/`.sqlite`/`.sqlite3`
+            database written by a sink.
+
+    Returns:
+        List[str]: The recorded links, in the order they were written.
+
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".jsonl":
+        with open(path, 'r', encoding='utf-8') as results_file:
+            return [json.loads(line).get("link") for line in results_file
+                    if line.strip()]
+    if extension in (".db", ".sqlite", ".sqlite3"):
+        conn = sqlite3.connect(path)
+        try:
+            rows = conn.execute("SELECT link FROM results ORDER BY id")
+            return [row[0] for row in rows]
+        finally:
+            conn.close()
+    raise ValueError(f"Unsupported result sink format: '{extension}'. "
+                     "Use .jsonl, .db or .sqlite.")
@@ -0,0 +1,275 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import yaml
+from bs4 import BeautifulSoup
+from openai import OpenAI
+from backends import BackendPool
+from deadline import Deadline
+
+# Set up logging
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s - %(levelname)s - %(module)s - "
+                           "%(message)s")
+
+# Constants
+YML_CONFIG = os.environ.get("YML_CONFIG", "./config/system_prompts.yml")
+SUMMARY_CACHE = os.environ.get("SUMMARY_CACHE",
+                               "./.cache/chunk_summaries.json")
+SUMMARIZER_MODEL = "gpt-4o-mini"
+CHUNK_TOKENS = 1500
+HEADING_TAGS = ("h1", "h2", "h3", "h4")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimates the token count of English text (about four characters
+    per token).
+    """
+    return (len(text) + 3) // 4
+
+
+def split_into_chunks(article_content: str,
+                      max_tokens: int = CHUNK_TOKENS) -> List[str]:
+    """
+    Splits an article's HTML into plain-text chunks that follow its sections.
+
+    A new section starts at every heading and becomes its own chunk; a
+    section longer than `max_tokens` is split between paragraphs. Chunks
+    never span sections, so editing a section only changes that section's
+    chunks and the cached summaries of the others stay valid. Plain text has
+    no headings and is treated as a single section.
+
+    Args:
+        article_content (str): The article HTML (plain text also works).
+        max_tokens (int): The target maximum size of a chunk.
+
+    Returns:
+        List[str]: The chunks, in article order.
+    """
+    soup = BeautifulSoup(article_content, 'html.parser')
+    blocks = soup.find_all(["p", "li", "pre", "blockquote", "figcaption",
+                            *HEADING_TAGS])
+    # Keep only outermost blocks so nested text is not repeated
+    block_ids = {id(b) for b in blocks}
+    blocks = [b for b in blocks
+              if not any(id(parent) in block_ids for parent in b.parents)]
+
+    sections: List[List[str]] = [[]]
+    if not blocks:
+        # Plain text: paragraphs are separated by blank lines
+        sections[-1] = [p.strip() for p in soup.get_text().split("\n\n")
+                        if p.strip()]
+    heading = None
+    for block in blocks:
+        text = block.get_text(" ", strip=True)
+        if not text:
+            continue
+        if block.name in HEADING_TAGS:
+            if sections[-1] or heading:
+                sections.append([])
+            # Keep the heading attached to the paragraph that follows it
+            heading = text if heading is None else f"{heading}\n{text}"
+            continue
+        if heading is not None:
+            text, heading = f"{heading}\n{text}", None
+        sections[-1].append(text)
+    if heading is not None:
+        sections[-1].append(heading)
+
+    chunks: List[str] = []
+    for section in sections:
+        # Chunks never span sections, so an edit can only move the chunk
+        # boundaries inside its own section
+        current: List[str] = []
+        current_tokens = 0
+        for paragraph in section:
+            paragraph_tokens = estimate_tokens(paragraph)
+            if current and current_tokens + paragraph_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(paragraph)
+            current_tokens += paragraph_tokens
+        if current:
+            chunks.append("\n".join(current))
+    return chunks
+
+
+class SummaryCache:
+    """
+    Caches chunk summaries by a hash of the chunk text and model.
+
+    The cache is persisted as JSON at `path` (if given) so later runs over an
+    edited article only summarize the sections that changed.
+
+    Args:
+        path (Optional[str]): The JSON file to load from and save to. None
+            keeps the cache in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._summaries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as cache_file:
+                    self._summaries = json.load(cache_file)
+            except (OSError, ValueError) as e:
+                logging.warning(
+                    f"Ignoring unreadable summary cache at {path}: {e}")
+
+    @staticmethod
+    def key(chunk: str, model: str) -> str:
+        digest = hashlib.sha256(f"{model}\0{chunk}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, chunk: str, model: str) -> Optional[str]:
+        with self._lock:
+            return self._summaries.get(self.key(chunk, model))
+
+    def put(self, chunk: str, model: str, summary: str):
+        with self._lock:
+            self._summaries[self.key(chunk, model)] = summary
+
+    def save(self):
+        """
+        Writes the cache to `path`, if one was given.
+
+        The cache is written to a temporary file and moved into place, so a
+        crash mid-write never leaves a truncated cache behind.
+        """
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(self._summaries, cache_file)
+            os.replace(tmp_path, self.path)
+
+
+def _load_system_message(key: str) -> str:
+    try:
+        with open(YML_CONFIG, 'r') as conf_file:
+            conf = yaml.safe_load(conf_file)
+    except FileNotFoundError:
+        logging.error(f"Configuration file not found at: {YML_CONFIG}")
+        raise FileNotFoundError(f"Configuration file {YML_CONFIG} not found.")
+    except yaml.YAMLError as e:
+        raise ValueError(f"Error parsing YAML file: {e}")
+
+    system_message = (conf or {}).get(key)
+    if not system_message:
+        logging.error(f"Missing `{key}` in configuration file.")
+        raise ValueError(f"The '{key}' key is missing in the configuration.")
+    return system_message
+
+
+def _complete(system_message: str, user_message: str, model: str,
+              deadline: Optional[Deadline],
+              pool: Optional[BackendPool]) -> str:
+    def create(client):
+        return client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_message}
+            ]
+        )
+
+    if pool is None:
+        openai_api_key = os.environ.get("OPENAI_KEY")
+        if not openai_api_key:
+            logging.error("OPENAI_KEY is not set in environment variables.")
+            raise ValueError(
+                "The OPENAI_API_KEY environment variable is not set.")
+        client = OpenAI(api_key=openai_api_key)
+        if deadline is not None:
+            # Each call gets whatever is left of the deadline when it starts
+            client = client.with_options(
+                timeout=deadline.check("summary call"), max_retries=0)
+        response = create(client)
+    else:
+        response = pool.call(create, deadline)
+
+    if not response.choices or not response.choices[0].message \
+            or not response.choices[0].message.content:
+        raise ValueError("Invalid response format from OpenAI API.")
+    return response.choices[0].message.content
+
+
+def build_article_brief(title: str, article_content: str,
+                        cache: Optional[SummaryCache] = None,
+                        model: str = SUMMARIZER_MODEL,
+                        chunk_tokens: int = CHUNK_TOKENS,
+                        max_workers: int = 4,
+                        deadline: Optional[Deadline] = None,
+                        pool: Optional[BackendPool] = None) -> str:
+    """
+    Condenses a long article into a compact brief with a map-reduce summary.
+
+    The article is split into section-aware chunks, uncached chunks are
+    summarized concurrently with a cheap model, and the chunk summaries are
+    reduced into one brief for the writer. Chunk summaries are cached by
+    chunk hash as soon as each one is ready, so a failed run still keeps the
+    chunks it finished.
+
+    Args:
+        title (str): The article title.
+        article_content (str): The article HTML.
+        cache (Optional[SummaryCache]): Cache for chunk summaries. Defaults
+            to no caching.
+        model (str): The model used for chunk summaries and the reduce step.
+        chunk_tokens (int): The target maximum size of a chunk.
+        max_workers (int): How many chunks to summarize at once.
+        deadline (Optional[Deadline]): The deadline every API call, map and
+            reduce, must finish by.
+        pool (Optional[BackendPool]): Backends to route calls across.
+
+    Returns:
+        str: The title followed by the brief.
+
+    Raises:
+        FileNotFoundError: If the configuration YAML file cannot be found.
+        ValueError: If the configuration or an API response is invalid.
+        DeadlineExceeded: If the deadline runs out before the brief is done.
+    """
+    cache = cache or SummaryCache()
+    chunk_message = _load_system_message('summarizer_chunk_message')
+    reduce_message = _load_system_message('summarizer_reduce_message')
+
+    chunks = split_into_chunks(article_content, chunk_tokens)
+    summaries = [cache.get(chunk, model) for chunk in chunks]
+    missing = [i for i, summary in enumerate(summaries) if summary is None]
+    logging.info(f"Summarizing {len(missing)} of {len(chunks)} chunk(s); "
+                 f"{len(chunks) - len(missing)} cached.")
+
+    def summarize(i: int) -> str:
+        user_message = (f"<article title=\"{title}\">\n{chunks[i]}\n"
+                        f"</article>\n\nSummarize this part of the article.")
+        summary = _complete(chunk_message, user_message, model, deadline,
+                            pool)
+        cache.put(chunks[i], model, summary)
+        return summary
+
+    if missing:
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for i, summary in zip(missing,
+                                      executor.map(summarize, missing)):
+                    summaries[i] = summary
+        finally:
+            cache.save()
+
+    notes = "\n\n".join(f"<section> {summary} </section>"
+                        for summary in summaries)
+    reduce_prompt = (f"{notes}\n\nCombine the section summaries of "
+                     f"\"{title}\" above into one brief.")
+    brief = _complete(reduce_message, reduce_prompt, model, deadline, pool)
+    logging.info("Article brief created.")
+    return f"{title}\n{brief}"
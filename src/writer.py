@@ -1,7 +1,11 @@
 import os
 import yaml
 import logging
+from typing import Optional
 from openai import OpenAI
+from prompt_cache import log_prompt_cache_usage
+from backends import BackendPool
+from deadline import Deadline
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
@@ -9,9 +13,41 @@ logging.basicConfig(level=logging.INFO,
 
 # Constants
 YML_CONFIG = os.environ.get("YML_CONFIG", "./config/system_prompts.yml")
+WRITER_INSTRUCTION = ("Given the Medium article content between the <article> "
+                      "tags above, generate the body of a LinkedIn post.")
 
 
-def write_post_openai(medium_content: str) -> str:
+def build_writer_messages(system_message: str, medium_content: str,
+                          instruction: str = WRITER_INSTRUCTION) -> list:
+    """
+    Builds the chat messages for a writer call with a prompt-cache friendly
+    layout.
+
+    Providers cache prompts by exact prefix, so the static system prompt comes
+    first, followed by the article body, and anything that varies per call
+    goes last. Every draft for the same article then shares the same long
+    prefix.
+
+    Args:
+        system_message (str): The writer system prompt.
+        medium_content (str): The content of the Medium article.
+        instruction (str): The per-call instruction appended after the
+            article.
+
+    Returns:
+        list: The messages to send to the chat completions API.
+    """
+    user_message = (
+        f"<article>\n{medium_content}\n</article>\n\n{instruction}")
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_message}
+    ]
+
+
+def write_post_openai(medium_content: str,
+                      deadline: Optional[Deadline] = None,
+                      pool: Optional[BackendPool] = None) -> str:
     """
     Generates a LinkedIn post body based on a Medium article's content using OpenAI's GPT model.
 
@@ -22,6 +58,11 @@ def write_post_openai(medium_content: str) -> str:
 
     Args:
         medium_content (str): The content of the Medium article to base the LinkedIn post on.
+        deadline (Optional[Deadline]): The deadline the API call must finish
+            by. Defaults to the client's timeout.
+        pool (Optional[BackendPool]): Backends to route the call across.
+            Defaults to a single client using the OPENAI_KEY environment
+            variable.
 
     Returns:
         str: The generated LinkedIn post content.
@@ -32,9 +73,9 @@ def write_post_openai(medium_content: str) -> str:
         ValueError: If there is an issue parsing the YAML file or the response from OpenAI.
         Exception: If an error occurs during the API call or response handling.
     """
-    # Check if OpenAI API key is set
+    # Check if OpenAI API key is set, unless a backend pool supplies them
     openai_api_key = os.environ.get("OPENAI_KEY")
-    if not openai_api_key:
+    if pool is None and not openai_api_key:
         logging.error("OPENAI_KEY is not set in environment variables.")
         raise ValueError("The OPENAI_API_KEY environment variable is not set.")
 
@@ -59,27 +100,33 @@ def write_post_openai(medium_content: str) -> str:
 
     logging.info("System message loaded successfully.")
 
-    user_message = (
-        f"""Given the Medium article content between the <article> tags, generate the body of a LinkedIn post.
-        <article> {medium_content} <article>"""
-    )
+    messages = build_writer_messages(system_message, medium_content)
 
     try:
 
-        client = OpenAI(api_key=openai_api_key)
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ]
-        )
+        def create(client):
+            return client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages
+            )
+
+        if pool is None:
+            client = OpenAI(api_key=openai_api_key)
+            if deadline is not None:
+                # Retries would run past the deadline, so a bounded call
+                # gets one attempt
+                client = client.with_options(timeout=deadline.check("call"),
+                                             max_retries=0)
+            response = create(client)
+        else:
+            response = pool.call(create, deadline)
 
         # Check if response is valid
         if not response.choices or not response.choices[0].message or not response.choices[0].message.content:
             raise ValueError("Invalid response format from OpenAI API.")
 
+        log_prompt_cache_usage(response, "writer")
+
         draft = response.choices[0].message.content
 
         logging.info("Successfully generated draft from OpenAI.")
@@ -0,0 +1,179 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from unittest.mock import patch, mock_open
+from backends import Backend, BackendPool
+from deadline import Deadline, DeadlineExceeded
+from writer import write_post_openai
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _stub_endpoint(status=200, content="Stub post"):
+    """Starts a local OpenAI-compatible chat completions endpoint."""
+    class Handler(BaseHTTPRequestHandler):
+        calls = 0
+
+        def do_POST(self):
+            Handler.calls += 1
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.dumps({
+                "id": "stub", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+            } if status == 200 else {"error": {"message": "stub failure"}}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, Handler, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def test_least_outstanding_respects_weights():
+    heavy = Backend("heavy", "k1", weight=2)
+    light = Backend("light", "k2", weight=1)
+    pool = BackendPool([heavy, light])
+
+    chosen = []
+    for _ in range(6):
+        backend = pool._acquire([])
+        chosen.append(backend.name)
+        pool._release(backend, 0.01)
+    assert chosen.count("heavy") == 4
+    assert chosen.count("light") == 2
+
+
+def test_failover_marks_backend_unhealthy():
+    clock = FakeClock()
+    bad = Backend("bad", "k1", cooldown=10)
+    good = Backend("good", "k2")
+    pool = BackendPool([bad, good], _clock=clock)
+
+    def fn(client):
+        if client.api_key == "k1":
+            raise RuntimeError("connection refused")
+        return "ok"
+
+    assert pool.call(fn) == "ok"
+    stats = {s["name"]: s for s in pool.stats()}
+    assert stats["bad"]["errors"] == 1 and not stats["bad"]["healthy"]
+    assert stats["good"]["requests"] == 1 and stats["good"]["healthy"]
+
+    # The failing backend is skipped until its cooldown ends
+    pool.call(fn)
+    assert stats["bad"]["requests"] == 1 == pool.stats()[0]["requests"]
+    clock.now += 11
+    assert pool.stats()[0]["healthy"]
+
+
+def test_all_backends_failing_raises_last_error():
+    pool = BackendPool([Backend("a", "k1"), Backend("b", "k2")])
+
+    def fn(client):
+        raise RuntimeError(f"down: {client.api_key}")
+
+    with pytest.raises(RuntimeError, match="down"):
+        pool.call(fn)
+    assert [s["errors"] for s in pool.stats()] == [1, 1]
+
+
+def test_from_config_reads_keys_from_env():
+    config = """
+backends:
+  - name: primary
+    api_key_env: PRIMARY_KEY
+    weight: 2
+  - name: stub
+    api_key: stub
+    base_url: http://localhost:8000/v1
+"""
+    with patch("builtins.open", mock_open(read_data=config)), \
+         patch.dict("os.environ", {"PRIMARY_KEY": "secret"}):
+        pool = BackendPool.from_config("backends.yml")
+    assert [(b.name, b.api_key, b.weight) for b in pool.backends] == [("primary", "secret", 2.0), ("stub", "stub", 1.0)]
+    assert pool.backends[1].base_url == "http://localhost:8000/v1"
+
+
+def test_from_config_missing_key():
+    with patch("builtins.open", mock_open(read_data="backends:\n  - name: nokey\n    api_key_env: UNSET_KEY\n")), \
+         patch.dict("os.environ", {}, clear=True):
+        with pytest.raises(ValueError, match="Backend 'nokey' has no API key configured."):
+            BackendPool.from_config("backends.yml")
+
+
+def test_writer_fails_over_between_stub_endpoints():
+    failing, failing_handler, failing_url = _stub_endpoint(status=503)
+    working, working_handler, working_url = _stub_endpoint(content="Stub post")
+    try:
+        pool = BackendPool([Backend("failing", "k1", failing_url, weight=10), Backend("working", "k2", working_url)])
+        with patch("writer.yaml.safe_load", return_value={"writer_system_message": "System"}), \
+             patch("builtins.open", mock_open(read_data="")):
+            assert write_post_openai("Article", deadline=Deadline(5), pool=pool) == "Stub post"
+        assert failing_handler.calls == 1
+        assert working_handler.calls == 1
+    finally:
+        failing.shutdown()
+        working.shutdown()
+
+
+def test_writer_fails_over_without_sdk_retries():
+    failing, failing_handler, failing_url = _stub_endpoint(status=503)
+    working, working_handler, working_url = _stub_endpoint(content="Stub post")
+    try:
+        pool = BackendPool([Backend("failing", "k1", failing_url, weight=10), Backend("working", "k2", working_url)])
+        with patch("writer.yaml.safe_load", return_value={"writer_system_message": "System"}), \
+             patch("builtins.open", mock_open(read_data="")):
+            assert write_post_openai("Article", pool=pool) == "Stub post"
+        # The failing backend is hit once, not retried by the SDK before failover
+        assert failing_handler.calls == 1
+        assert working_handler.calls == 1
+    finally:
+        failing.shutdown()
+        working.shutdown()
+
+
+def test_failover_stops_at_deadline():
+    clock = FakeClock()
+    deadline = Deadline(10, _clock=clock)
+    pool = BackendPool([Backend("a", "k1"), Backend("b", "k2")], _clock=clock)
+    timeouts = []
+
+    def fn(client):
+        timeouts.append(client.timeout)
+        clock.now += 11
+        raise RuntimeError("timed out")
+
+    with pytest.raises(DeadlineExceeded):
+        pool.call(fn, deadline)
+    assert timeouts == [10]
+
+
+def test_failover_attempts_get_remaining_time():
+    clock = FakeClock()
+    deadline = Deadline(10, _clock=clock)
+    pool = BackendPool([Backend("a", "k1"), Backend("b", "k2")], _clock=clock)
+    timeouts = []
+
+    def fn(client):
+        timeouts.append(client.timeout)
+        if len(timeouts) == 1:
+            clock.now += 6
+            raise RuntimeError("timed out")
+        return "ok"
+
+    assert pool.call(fn, deadline) == "ok"
+    assert timeouts == [10, 4]
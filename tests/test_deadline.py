@@ -0,0 +1,47 @@
+import pytest
+from deadline import Deadline, DeadlineExceeded, remaining_or_none
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_remaining_counts_down():
+    clock = FakeClock()
+    deadline = Deadline(10, _clock=clock)
+    clock.now += 4
+    assert deadline.remaining() == pytest.approx(6)
+    assert not deadline.expired()
+
+
+def test_check_raises_once_expired():
+    clock = FakeClock()
+    deadline = Deadline(1, _clock=clock)
+    clock.now += 2
+    assert deadline.remaining() == 0
+    with pytest.raises(DeadlineExceeded, match="Deadline exceeded before scrape."):
+        deadline.check("scrape")
+
+
+def test_child_takes_share_of_remaining_time():
+    clock = FakeClock()
+    deadline = Deadline(10, _clock=clock)
+    clock.now += 2
+    child = deadline.child(0.5)
+    assert child.remaining() == pytest.approx(4)
+    assert child.expires_at <= deadline.expires_at
+
+
+def test_child_rejects_invalid_fraction():
+    with pytest.raises(ValueError):
+        Deadline(10).child(1.5)
+
+
+def test_remaining_or_none():
+    assert remaining_or_none(None) is None
+    clock = FakeClock()
+    assert remaining_or_none(Deadline(3, _clock=clock)) == pytest.approx(3)
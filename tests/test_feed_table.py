@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+from feed_table import (
+    FEED_TABLE_COLUMNS,
+    build_feed_table,
+    estimate_writer_prompt_tokens,
+    filter_by_tag,
+    load_feed_table,
+    longest,
+    save_feed_table,
+    shortest,
+    unposted_since,
+)
+
+FEEDS = {
+    "https://medium.com/feed/@testuser": [
+        {"title": "BigQuery Partitioning", "tags": ["data", "google-cloud"], "article_content": "a" * 400,
+         "link": "https://example.com/1", "published": "Mon, 01 Jan 2024 10:00:00 GMT"},
+        {"title": "Kubernetes Basics", "tags": ["DevOps"], "article_content": "b" * 40,
+         "link": "https://example.com/2", "published": "Fri, 01 Mar 2024 10:00:00 GMT"},
+        {"title": "Untagged", "tags": [], "article_content": "c" * 4000,
+         "link": "https://example.com/3", "published": None},
+    ]
+}
+
+
+@pytest.fixture
+def table():
+    return build_feed_table(FEEDS)
+
+
+def test_build_feed_table(table):
+    assert list(table.columns) == FEED_TABLE_COLUMNS
+    assert table["est_tokens"].tolist() == [100, 10, 1000]
+    assert table["content_length"].tolist() == [400, 40, 4000]
+    assert table.loc[0, "published"] == pd.Timestamp("2024-01-01 10:00", tz="UTC")
+    assert pd.isna(table.loc[2, "published"])
+
+
+def test_filter_by_tag(table):
+    assert filter_by_tag(table, "Data")["title"].tolist() == ["BigQuery Partitioning"]
+    assert filter_by_tag(table, "devops")["title"].tolist() == ["Kubernetes Basics"]
+    assert filter_by_tag(table, "missing").empty
+
+
+def test_unposted_since(table):
+    result = unposted_since(table, posted_guids=["https://example.com/1"])
+    assert set(result["guid"]) == {"https://example.com/2", "https://example.com/3"}
+
+    result = unposted_since(table, since="2024-02-01")
+    assert result["title"].tolist() == ["Kubernetes Basics"]
+
+
+def test_longest_and_shortest(table):
+    assert longest(table, 1)["title"].tolist() == ["Untagged"]
+    assert shortest(table, 2)["title"].tolist() == ["Kubernetes Basics", "BigQuery Partitioning"]
+
+
+def test_estimate_writer_prompt_tokens(table):
+    assert estimate_writer_prompt_tokens(table) == (100 + 10 + 1000) * 3
+    assert estimate_writer_prompt_tokens(table, token_budget=500,
+                                         calls_per_article=1) == 100 + 10 + 500
+
+
+def test_parquet_round_trip(table, tmp_path):
+    path = str(tmp_path / "feed_table.parquet")
+    save_feed_table(table, path)
+    loaded = load_feed_table(path)
+    pd.testing.assert_frame_equal(loaded, table)
+    assert filter_by_tag(loaded, "data")["title"].tolist() == ["BigQuery Partitioning"]
@@ -0,0 +1,156 @@
+import threading
+import time
+import pytest
+from deadline import Deadline, DeadlineExceeded
+from hedging import HedgedCaller
+
+
+def test_no_hedge_without_history():
+    hedger = HedgedCaller(percentile=50, max_hedge_ratio=1.0)
+    assert hedger.hedge_delay() is None
+    assert hedger.call(lambda: "ok") == "ok"
+    assert hedger.hedges == 0
+
+
+def test_hedge_delay_uses_percentile():
+    hedger = HedgedCaller(percentile=50, min_samples=3)
+    for latency in (0.3, 0.1, 0.2):
+        hedger.record(latency)
+    assert hedger.hedge_delay() == 0.2
+
+
+def test_slow_call_is_hedged_and_fast_duplicate_wins():
+    hedger = HedgedCaller(percentile=50, max_hedge_ratio=1.0, min_samples=1)
+    hedger.record(0.01)
+    release = threading.Event()
+    attempts = []
+
+    def call():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            # The first attempt stalls until the test ends
+            release.wait(2)
+            return "slow"
+        return "fast"
+
+    try:
+        assert hedger.call(call) == "fast"
+    finally:
+        release.set()
+    assert hedger.hedges == 1
+
+
+def test_attempts_do_not_hold_up_exit():
+    hedger = HedgedCaller(percentile=50, max_hedge_ratio=1.0, min_samples=1)
+    hedger.record(0.01)
+    release = threading.Event()
+    daemon = []
+
+    def call():
+        daemon.append(threading.current_thread().daemon)
+        if len(daemon) == 1:
+            release.wait(2)
+            return "slow"
+        return "fast"
+
+    try:
+        assert hedger.call(call) == "fast"
+    finally:
+        release.set()
+    # Both attempts ran on daemon threads, which exit does not wait for
+    assert daemon == [True, True]
+
+
+def test_hedges_are_capped():
+    hedger = HedgedCaller(percentile=50, max_hedge_ratio=0.0, min_samples=1)
+    hedger.record(0.001)
+    assert hedger.call(lambda: time.sleep(0.02) or "done") == "done"
+    assert hedger.hedges == 0
+
+
+def test_failed_attempt_surfaces_error():
+    hedger = HedgedCaller()
+
+    def call():
+        raise RuntimeError("API Error")
+
+    with pytest.raises(RuntimeError, match="API Error"):
+        hedger.call(call)
+
+
+def test_call_respects_deadline():
+    hedger = HedgedCaller()
+    release = threading.Event()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            hedger.call(lambda: release.wait(2), Deadline(0.05))
+    finally:
+        release.set()
+
+
+def test_hedge_budget_accrues_with_calls():
+    hedger = HedgedCaller(max_hedge_ratio=0.1)
+    hedger.calls = 9
+    # No free first hedge: 1 of 9 calls would exceed the ratio
+    assert not hedger._take_hedge()
+
+    hedger.calls = 10
+    assert hedger._take_hedge()
+    assert not hedger._take_hedge()
+    assert hedger.hedges == 1
+
+
+def test_single_call_is_not_hedged_at_low_ratio():
+    hedger = HedgedCaller(percentile=50, max_hedge_ratio=0.1, min_samples=1)
+    hedger.record(0.001)
+    assert hedger.call(lambda: time.sleep(0.02) or "done") == "done"
+    assert (hedger.calls, hedger.hedges) == (1, 0)
+
+
+def test_latency_history_round_trip(tmp_path):
+    path = str(tmp_path / "cache" / "latency_history.json")
+    draft = HedgedCaller(name="draft")
+    review = HedgedCaller(name="review")
+    for latency in (1.0, 2.0):
+        draft.record(latency)
+    review.record(3.0)
+    draft.save_history(path)
+    review.save_history(path)
+
+    restored = HedgedCaller(name="draft", min_samples=2)
+    restored.load_history(path)
+    assert restored.hedge_delay() == 2.0
+
+    restored_review = HedgedCaller(name="review", min_samples=1)
+    restored_review.load_history(path)
+    assert restored_review.hedge_delay() == 3.0
+
+
+def test_hedge_counts_persist_across_runs(tmp_path):
+    path = str(tmp_path / "latency_history.json")
+    first_run = HedgedCaller(name="draft")
+    first_run.calls, first_run.hedges = 9, 0
+    first_run.save_history(path)
+
+    # Two later runs share the file; each adds only its own calls
+    second_run = HedgedCaller(name="draft")
+    second_run.load_history(path)
+    third_run = HedgedCaller(name="draft")
+    third_run.load_history(path)
+    assert (second_run.calls, second_run.hedges) == (9, 0)
+
+    second_run.calls += 1
+    assert second_run._take_hedge()
+    second_run.save_history(path)
+    third_run.calls += 2
+    third_run.save_history(path)
+
+    restored = HedgedCaller(name="draft")
+    restored.load_history(path)
+    assert (restored.calls, restored.hedges) == (12, 1)
+
+
+def test_load_history_missing_file(tmp_path):
+    hedger = HedgedCaller()
+    hedger.load_history(str(tmp_path / "missing.json"))
+    assert hedger.hedge_delay() is None
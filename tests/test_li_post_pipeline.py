@@ -1,3 +1,4 @@
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
 from li_post_pipeline import (
@@ -5,7 +6,13 @@ from li_post_pipeline import (
     create_post_draft,
     rank_post_drafts,
     add_boilerplate,
+    stage_deadline,
+    selected_draft_index,
+    prepare_article_text,
+    main,
 )
+from deadline import Deadline
+from hedging import HedgedCaller
 
 
 def test_scrape_medium_article_success():
@@ -20,7 +27,7 @@ def test_scrape_medium_article_success():
 
     with patch("li_post_pipeline.scrape_article", return_value=mock_article_data) as mock_scrape:
         result = scrape_medium_article(mock_feed, mock_title)
-        mock_scrape.assert_called_once_with(mock_feed, mock_title)
+        mock_scrape.assert_called_once_with(mock_feed, mock_title, timeout=None)
         assert result == mock_article_data
 
 
@@ -39,7 +46,7 @@ def test_create_post_draft_success():
 
     with patch("li_post_pipeline.write_post_openai", return_value=mock_draft) as mock_write:
         result = create_post_draft(mock_article_text)
-        mock_write.assert_called_once_with(mock_article_text)
+        mock_write.assert_called_once_with(mock_article_text, deadline=None, pool=None)
         assert result == mock_draft
 
 
@@ -57,7 +64,7 @@ def test_rank_post_drafts_success():
 
     with patch("li_post_pipeline.review_drafts_openai", return_value=mock_best_draft) as mock_review:
         result = rank_post_drafts(mock_drafts)
-        mock_review.assert_called_once_with(mock_drafts)
+        mock_review.assert_called_once_with(mock_drafts, deadline=None, pool=None)
         assert result == mock_best_draft
 
 
@@ -101,3 +108,125 @@ def test_add_boilerplate_empty_tags():
 
     result = add_boilerplate(mock_post_body, mock_tags, mock_article_url)
     assert result == expected_output
+
+
+def test_create_post_draft_passes_deadline():
+    mock_article_text = "Test article content."
+    deadline = Deadline(30)
+
+    with patch("li_post_pipeline.write_post_openai", return_value="Draft") as mock_write:
+        create_post_draft(mock_article_text, deadline)
+        assert mock_write.call_args.kwargs["deadline"] is deadline
+
+
+def test_create_post_draft_with_hedger():
+    hedger = MagicMock()
+    hedger.call.return_value = "Hedged draft"
+
+    with patch("li_post_pipeline.write_post_openai"):
+        assert create_post_draft("Test article content.", hedger=hedger) == "Hedged draft"
+        hedger.call.assert_called_once()
+
+
+def test_stage_deadline_rolls_over_unused_time():
+    deadline = Deadline(100)
+    assert stage_deadline(None, "scrape") is None
+    assert stage_deadline(deadline, "scrape").remaining() == pytest.approx(10, abs=0.5)
+    # The review stage is last, so it receives all of the remaining time
+    assert stage_deadline(deadline, "review").remaining() == pytest.approx(100, abs=0.5)
+
+
+def test_selected_draft_index():
+    drafts = ["Draft 1", "Draft 2", "Draft 3"]
+    assert selected_draft_index(drafts, "  Draft 2\n") == 1
+    assert selected_draft_index(drafts, "Something else") is None
+
+
+def test_main_records_result_to_sink():
+    mock_article_data = {
+        "title": "Test Article",
+        "tags": ["Tag1"],
+        "article_content": "Content.",
+        "link": "https://example.com/article",
+    }
+    sink = MagicMock()
+
+    with patch("li_post_pipeline.scrape_article", return_value=mock_article_data), \
+         patch("li_post_pipeline.write_post_openai", side_effect=["Draft 1", "Draft 2", "Draft 3"]), \
+         patch("li_post_pipeline.review_drafts_openai", return_value="Draft 3"):
+        main("https://medium.com/feed/@testuser", "Test Article", sink=sink)
+
+    record = sink.write.call_args.args[0]
+    assert record["title"] == "Test Article"
+    assert record["drafts"] == ["Draft 1", "Draft 2", "Draft 3"]
+    assert record["selected_index"] == 2
+    assert record["final_post"] == add_boilerplate("Draft 3", ["Tag1"], "https://example.com/article")
+    assert len(record["timings"]["drafts"]) == 3
+    assert record["timings"]["total"] >= record["timings"]["review"]
+
+
+def test_prepare_article_text_short_article_passes_through():
+    with patch("li_post_pipeline.build_article_brief") as mock_brief:
+        assert prepare_article_text("Title", "Short content.") == "Title\nShort content."
+        mock_brief.assert_not_called()
+
+
+def test_prepare_article_text_long_article_uses_brief():
+    with patch("li_post_pipeline.build_article_brief", return_value="Title\nBrief") as mock_brief:
+        assert prepare_article_text("Title", "word " * 1000, token_budget=100) == "Title\nBrief"
+        mock_brief.assert_called_once()
+
+
+def test_prepare_article_text_passes_deadline_to_brief():
+    deadline = Deadline(60)
+    with patch("li_post_pipeline.build_article_brief", return_value="Title\nBrief") as mock_brief:
+        prepare_article_text("Title", "word " * 1000, token_budget=100, deadline=deadline)
+        assert mock_brief.call_args.kwargs["deadline"] is deadline
+
+
+def test_main_hedges_slow_review(tmp_path):
+    history = str(tmp_path / "latency_history.json")
+    mock_article_data = {
+        "title": "Test Article",
+        "tags": ["Tag1"],
+        "article_content": "Content.",
+        "link": "https://example.com/article",
+    }
+    review_calls = []
+    release = threading.Event()
+
+    def slow_first_review(drafts, deadline=None, pool=None):
+        review_calls.append(None)
+        if len(review_calls) == 1:
+            release.wait(2)
+        return "Draft 1"
+
+    # History from earlier runs: reviews usually answer in 10ms, and nine
+    # unhedged calls leave room for one hedge at the default 10% ratio
+    seed = HedgedCaller(name="review")
+    for _ in range(5):
+        seed.record(0.01)
+    seed.calls = 9
+    seed.save_history(history)
+
+    with patch("li_post_pipeline._HEDGERS", {}) as hedgers, \
+         patch("li_post_pipeline.LATENCY_HISTORY", history), \
+         patch("li_post_pipeline.scrape_article",
+               return_value=mock_article_data), \
+         patch("li_post_pipeline.write_post_openai", return_value="Draft 1"), \
+         patch("li_post_pipeline.review_drafts_openai",
+               side_effect=slow_first_review):
+        try:
+            main("https://medium.com/feed/@testuser", "Test Article",
+                 hedge_percentile=95)
+        finally:
+            release.set()
+
+        assert hedgers["review"].hedges == 1
+        assert len(review_calls) == 2
+
+    # The spend is saved, so the next run has no hedge budget left
+    restored = HedgedCaller(name="review")
+    restored.load_history(history)
+    assert (restored.calls, restored.hedges) == (10, 1)
+    assert not restored._take_hedge()
@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock
+from prompt_cache import cached_prompt_tokens, log_prompt_cache_usage
+
+
+def _response(cached_tokens, prompt_tokens=2048):
+    response = MagicMock()
+    response.usage.prompt_tokens = prompt_tokens
+    response.usage.prompt_tokens_details.cached_tokens = cached_tokens
+    return response
+
+
+def test_cached_prompt_tokens_reads_usage_details():
+    assert cached_prompt_tokens(_response(1536)) == 1536
+
+
+def test_cached_prompt_tokens_missing_usage():
+    response = MagicMock()
+    response.usage = None
+    assert cached_prompt_tokens(response) == 0
+
+
+def test_cached_prompt_tokens_missing_details():
+    response = MagicMock()
+    response.usage.prompt_tokens_details = None
+    assert cached_prompt_tokens(response) == 0
+
+
+def test_log_prompt_cache_usage(caplog):
+    with caplog.at_level("INFO"):
+        cached = log_prompt_cache_usage(_response(1024), "writer")
+    assert cached == 1024
+    assert "writer prompt cache: 1024/2048 prompt tokens cached." in caplog.text
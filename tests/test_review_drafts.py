@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import patch, mock_open
 
-from reviewer import review_drafts_openai
+from reviewer import review_drafts_openai, build_reviewer_messages, REVIEWER_INSTRUCTION
 
 # Mock constants
 VALID_POSTS = ["Post 1 content", "Post 2 content", "Post 3 content"]
@@ -72,3 +72,12 @@ def test_openai_api_error():
 
         with pytest.raises(Exception, match="API Error"):
             review_drafts_openai(VALID_POSTS)
+
+def test_build_reviewer_messages_layout():
+    """Test drafts precede the instruction so the instruction is the only tail."""
+    messages = build_reviewer_messages("System", VALID_POSTS)
+    assert messages[0] == {"role": "system", "content": "System"}
+    user_message = messages[1]["content"]
+    assert user_message.startswith("# POST #1 <post> Post 1 content </post>")
+    assert "# POST #3 <post> Post 3 content </post>" in user_message
+    assert user_message.endswith(REVIEWER_INSTRUCTION)
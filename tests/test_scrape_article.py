@@ -1,8 +1,9 @@
+import pickle
 import pytest
 from unittest.mock import patch
 from bs4 import BeautifulSoup
 import requests
-from scraper import scrape_article
+from scraper import scrape_article, parse_feed, parse_feeds, scrape_feeds
 
 # Sample RSS feed data for testing
 RSS_FEED_DATA = """
@@ -105,3 +106,42 @@ def test_scrape_article_invalid_feed(mock_get):
 
     result = scrape_article(feed_url, article_title)
     assert result is None
+
+
+def test_parse_feed_returns_plain_records():
+    """
+    Test that parse_feed returns picklable dictionaries for every item in the feed.
+    """
+    records = parse_feed(RSS_FEED_DATA)
+
+    assert len(records) == 2
+    assert records[1]["title"] == "Introduction to Kubernetes"
+    assert records[1]["tags"] == ["DevOps", "Containers"]
+    assert records[1]["link"] == "https://example.com/article2"
+    assert records[1]["published"] is None
+    assert pickle.loads(pickle.dumps(records)) == records
+
+
+def test_parse_feeds_process_pool_matches_serial():
+    """
+    Test that parsing in worker processes gives the same records, in order, as parsing inline.
+    """
+    feeds = [RSS_FEED_DATA, "<rss></rss>", RSS_FEED_DATA]
+
+    assert parse_feeds(feeds, max_workers=2) == parse_feeds(feeds, max_workers=1)
+    assert [len(records) for records in parse_feeds(feeds, max_workers=2)] == [2, 0, 2]
+
+
+@patch("requests.get")
+def test_scrape_feeds(mock_get):
+    """
+    Test that scrape_feeds downloads every feed and keys the parsed records by URL.
+    """
+    mock_get.return_value.text = RSS_FEED_DATA
+    feed_urls = ["https://example.com/feed1", "https://example.com/feed2"]
+
+    result = scrape_feeds(feed_urls, max_workers=1, timeout=5)
+
+    assert list(result) == feed_urls
+    assert all(len(records) == 2 for records in result.values())
+    mock_get.assert_any_call("https://example.com/feed1", timeout=5)
@@ -0,0 +1,110 @@
+import json
+import sqlite3
+import pytest
+from sinks import (JSONLSink, ResultSink, SQLiteSink, open_sink,
+                   read_result_links)
+
+RECORD = {
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "title": "Test Article",
+    "link": "https://example.com/article",
+    "tags": ["Tag1", "Tag2"],
+    "drafts": ["Draft 1", "Draft 2", "Draft 3"],
+    "selected_index": 1,
+    "final_post": "Draft 2\n\n#Tag1 #Tag2",
+    "timings": {"scrape": 0.1, "drafts": [1.0, 1.1, 0.9], "review": 0.5, "total": 3.6},
+}
+
+
+def test_jsonl_sink_buffers_until_batch_is_full(tmp_path):
+    path = tmp_path / "results.jsonl"
+    sink = JSONLSink(str(path), batch_size=2, fsync=False)
+
+    sink.write(RECORD)
+    assert path.read_text() == ""
+
+    sink.write(RECORD)
+    assert len(path.read_text().splitlines()) == 2
+
+    sink.write(RECORD)
+    sink.close()
+    lines = path.read_text().splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[0]) == RECORD
+
+
+def test_sqlite_sink_round_trip(tmp_path):
+    path = tmp_path / "results.db"
+    with SQLiteSink(str(path), batch_size=10) as sink:
+        for _ in range(3):
+            sink.write(RECORD)
+
+    conn = sqlite3.connect(str(path))
+    rows = conn.execute("SELECT title, tags, drafts, selected_index, timings FROM results").fetchall()
+    conn.close()
+    assert len(rows) == 3
+    title, tags, drafts, selected_index, timings = rows[0]
+    assert title == "Test Article"
+    assert json.loads(tags) == RECORD["tags"]
+    assert json.loads(drafts) == RECORD["drafts"]
+    assert selected_index == 1
+    assert json.loads(timings) == RECORD["timings"]
+
+
+def test_open_sink_by_extension(tmp_path):
+    jsonl = open_sink(str(tmp_path / "out.jsonl"))
+    sqlite = open_sink(str(tmp_path / "out.sqlite"))
+    assert isinstance(jsonl, JSONLSink)
+    assert isinstance(sqlite, SQLiteSink)
+    jsonl.close()
+    sqlite.close()
+
+    with pytest.raises(ValueError, match="Unsupported result sink format"):
+        open_sink(str(tmp_path / "out.csv"))
+
+
+def test_failed_write_keeps_buffered_records():
+    class FlakySink(ResultSink):
+        def __init__(self):
+            super().__init__(batch_size=2)
+            self.failures = 1
+            self.written = []
+
+        def _write_batch(self, batch):
+            if self.failures:
+                self.failures -= 1
+                raise OSError("disk full")
+            self.written.extend(batch)
+
+    sink = FlakySink()
+    sink.write(RECORD)
+    with pytest.raises(OSError, match="disk full"):
+        sink.write(dict(RECORD, link="https://example.com/other"))
+    assert sink.written == []
+
+    sink.flush()
+    assert [r["link"] for r in sink.written] == [
+        "https://example.com/article", "https://example.com/other"]
+
+
+def test_result_sink_requires_write_batch():
+    class IncompleteSink(ResultSink):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteSink()
+
+
+def test_invalid_batch_size(tmp_path):
+    with pytest.raises(ValueError, match="`batch_size` must be at least 1."):
+        JSONLSink(str(tmp_path / "out.jsonl"), batch_size=0)
+
+
+@pytest.mark.parametrize("filename", ["results.jsonl", "results.db"])
+def test_read_result_links(tmp_path, filename):
+    path = str(tmp_path / filename)
+    with open_sink(path) as sink:
+        sink.write(RECORD)
+        sink.write(dict(RECORD, link="https://example.com/other"))
+
+    assert read_result_links(path) == ["https://example.com/article", "https://example.com/other"]
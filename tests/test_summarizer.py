@@ -0,0 +1,173 @@
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+from deadline import Deadline
+from summarizer import SummaryCache, build_article_brief, estimate_tokens, split_into_chunks
+
+SYSTEM_MESSAGES = {
+    "summarizer_chunk_message": "Summarize a section.",
+    "summarizer_reduce_message": "Combine summaries.",
+}
+
+ARTICLE_HTML = (
+    "<h2>Partitioning</h2><p>" + "Partitions split tables by date. " * 40 + "</p>"
+    "<h2>Clustering</h2><p>" + "Clustering sorts data within partitions. " * 40 + "</p>"
+    "<h2>Costs</h2><p>" + "Pruning partitions cuts query costs. " * 40 + "</p>"
+)
+
+
+def _fake_openai(calls):
+    """Returns a patched OpenAI class whose completions echo a summary of the input."""
+    def create(model, messages):
+        calls.append(messages[1]["content"])
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=f"summary {len(calls)}"))]
+        return response
+
+    mock_openai = MagicMock()
+    mock_openai.return_value.chat.completions.create.side_effect = create
+    return mock_openai
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 10) == 10
+
+
+def test_split_into_chunks_follows_sections():
+    chunks = split_into_chunks(ARTICLE_HTML, max_tokens=400)
+    assert len(chunks) == 3
+    assert chunks[0].startswith("Partitioning")
+    assert chunks[1].startswith("Clustering")
+    assert chunks[2].startswith("Costs")
+
+
+def test_split_into_chunks_keeps_sections_apart():
+    chunks = split_into_chunks("<h2>A</h2><p>one</p><h2>B</h2><p>two</p>", max_tokens=100)
+    assert chunks == ["A\none", "B\ntwo"]
+
+
+def test_split_into_chunks_splits_long_sections_between_paragraphs():
+    html = "<h2>Long</h2>" + "".join(f"<p>{'word ' * 40}{i}</p>" for i in range(10))
+    chunks = split_into_chunks(html, max_tokens=120)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 120 for chunk in chunks)
+
+
+def test_split_into_chunks_plain_text():
+    chunks = split_into_chunks("First paragraph.\n\nSecond paragraph.", max_tokens=5)
+    assert chunks == ["First paragraph.", "Second paragraph."]
+
+
+def test_summary_cache_persists(tmp_path):
+    path = str(tmp_path / "cache" / "summaries.json")
+    cache = SummaryCache(path)
+    cache.put("chunk", "gpt-4o-mini", "summary")
+    cache.save()
+
+    reloaded = SummaryCache(path)
+    assert reloaded.get("chunk", "gpt-4o-mini") == "summary"
+    assert reloaded.get("chunk", "other-model") is None
+    # Saved through a temporary file that is moved into place
+    assert os.listdir(os.path.dirname(path)) == ["summaries.json"]
+
+
+def test_build_article_brief_saves_finished_chunks_on_failure(tmp_path):
+    path = str(tmp_path / "summaries.json")
+
+    def create(model, messages):
+        if "Clustering" in messages[1]["content"]:
+            raise RuntimeError("API down")
+        return MagicMock(choices=[MagicMock(message=MagicMock(content="summary"))])
+
+    with patch("summarizer._load_system_message", side_effect=SYSTEM_MESSAGES.get), \
+         patch("os.environ.get", return_value="mock_api_key"), \
+         patch("summarizer.OpenAI") as mock_openai:
+        mock_openai.return_value.chat.completions.create.side_effect = create
+        with pytest.raises(RuntimeError, match="API down"):
+            build_article_brief("BigQuery Guide", ARTICLE_HTML, SummaryCache(path),
+                                chunk_tokens=400, max_workers=1)
+
+    # The chunks that were summarized survive the failed run
+    reloaded = SummaryCache(path)
+    cached = [reloaded.get(chunk, "gpt-4o-mini")
+              for chunk in split_into_chunks(ARTICLE_HTML, max_tokens=400)]
+    assert cached == ["summary", None, "summary"]
+
+
+def test_build_article_brief_times_each_call_from_the_deadline():
+    now = [0.0]
+    deadline = Deadline(30, _clock=lambda: now[0])
+    timeouts = []
+
+    def with_options(timeout, max_retries):
+        assert max_retries == 0
+        timeouts.append(timeout)
+        now[0] += 5
+        return client
+
+    def create(model, messages):
+        return MagicMock(choices=[MagicMock(message=MagicMock(content="summary"))])
+
+    client = MagicMock()
+    client.with_options.side_effect = with_options
+    client.chat.completions.create.side_effect = create
+    with patch("summarizer._load_system_message", side_effect=SYSTEM_MESSAGES.get), \
+         patch("os.environ.get", return_value="mock_api_key"), \
+         patch("summarizer.OpenAI", return_value=client):
+        build_article_brief("BigQuery Guide", ARTICLE_HTML, chunk_tokens=400,
+                            max_workers=1, deadline=deadline)
+
+    # Three chunk summaries then the reduce step, each bounded by what is left
+    assert timeouts == [30, 25, 20, 15]
+
+
+def test_build_article_brief_only_resummarizes_changed_chunks():
+    cache = SummaryCache()
+    calls = []
+
+    with patch("summarizer._load_system_message", side_effect=SYSTEM_MESSAGES.get), \
+         patch("os.environ.get", return_value="mock_api_key"), \
+         patch("summarizer.OpenAI", _fake_openai(calls)):
+        brief = build_article_brief("BigQuery Guide", ARTICLE_HTML, cache, chunk_tokens=400)
+        assert brief.startswith("BigQuery Guide\n")
+        # Three chunk summaries plus the reduce step
+        assert len(calls) == 4
+
+        calls.clear()
+        edited = ARTICLE_HTML.replace("Pruning partitions", "Pruning old partitions")
+        build_article_brief("BigQuery Guide", edited, cache, chunk_tokens=400)
+        # Only the edited section is summarized again, then reduced
+        assert len(calls) == 2
+        assert "Pruning old partitions" in calls[0]
+
+
+def test_build_article_brief_early_edit_only_resummarizes_its_section():
+    sections = ["Partitioning", "Clustering", "Costs", "Quotas"]
+    article = "".join(f"<h2>{name}</h2><p>{name} notes. " + "x" * 2380 + "</p>"
+                      for name in sections)
+    cache = SummaryCache()
+    calls = []
+
+    with patch("summarizer._load_system_message", side_effect=SYSTEM_MESSAGES.get), \
+         patch("os.environ.get", return_value="mock_api_key"), \
+         patch("summarizer.OpenAI", _fake_openai(calls)):
+        build_article_brief("BigQuery Guide", article, cache)
+        # Four chunk summaries plus the reduce step
+        assert len(calls) == 5
+
+        calls.clear()
+        # Growing the first section must not shift the chunks after it
+        edited = article.replace("Partitioning notes. ", "Partitioning notes. " + "y" * 1600)
+        build_article_brief("BigQuery Guide", edited, cache)
+        assert len(calls) == 2
+        assert "Partitioning notes." in calls[0]
+
+
+def test_build_article_brief_invalid_response():
+    with patch("summarizer._load_system_message", side_effect=SYSTEM_MESSAGES.get), \
+         patch("os.environ.get", return_value="mock_api_key"), \
+         patch("summarizer.OpenAI") as mock_openai:
+        mock_openai.return_value.chat.completions.create.return_value = MagicMock(choices=[])
+        with pytest.raises(ValueError, match="Invalid response format from OpenAI API."):
+            build_article_brief("Title", ARTICLE_HTML)
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import patch, MagicMock, mock_open
-from writer import write_post_openai  # Replace with the actual module name
+from writer import write_post_openai, build_writer_messages
 
 # Sample data for testing
 MOCK_MEDIUM_CONTENT = "This is a sample Medium article content."
@@ -98,4 +98,18 @@ def test_invalid_openai_response():
 
         # Call the function and check if it raises a ValueError or handles the invalid response
         with pytest.raises(ValueError, match="Invalid response format from OpenAI API."):
-            write_post_openai(MOCK_MEDIUM_CONTENT)
\ No newline at end of file
+            write_post_openai(MOCK_MEDIUM_CONTENT)
+
+# Test that the article forms a stable prefix ahead of the per-call instruction
+def test_build_writer_messages_layout():
+    messages = build_writer_messages(MOCK_SYSTEM_MESSAGE, MOCK_MEDIUM_CONTENT, "Draft #2 instruction.")
+
+    assert messages[0] == {"role": "system", "content": MOCK_SYSTEM_MESSAGE}
+    user_message = messages[1]["content"]
+    assert user_message.startswith(f"<article>\n{MOCK_MEDIUM_CONTENT}\n</article>")
+    assert user_message.endswith("Draft #2 instruction.")
+
+    # Calls with different instructions share everything up to the tail
+    other = build_writer_messages(MOCK_SYSTEM_MESSAGE, MOCK_MEDIUM_CONTENT)[1]["content"]
+    prefix = f"<article>\n{MOCK_MEDIUM_CONTENT}\n</article>\n\n"
+    assert other.startswith(prefix) and user_message.startswith(prefix)